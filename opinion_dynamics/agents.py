@@ -5,11 +5,271 @@ Handles Claude API calls to generate agent posts and analyzes
 content for emotional/confrontational characteristics.
 """
 
+import asyncio
+import functools
+import hashlib
+import os
 import re
-import anthropic
-from typing import Optional
+import sqlite3
+import string
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+import numpy as np
+from typing import TYPE_CHECKING, List, Optional
 from models import Agent, AgentRole, Post, EmotionalState
 from prompts import get_system_prompt, format_prompt
+from kernels import score_post, score_posts
+
+if TYPE_CHECKING:
+    import anthropic
+
+# Optional: Aho-Corasick automaton for the word lists (pip install ahocorasick-rs)
+try:
+    import ahocorasick_rs
+except ImportError:
+    ahocorasick_rs = None  # fall back to per-word substring checks
+
+
+# Language-independent patterns, compiled once at import
+_SCARE_QUOTE_DOUBLE_RE = re.compile(r'"[^"]{1,20}"')
+_SCARE_QUOTE_SINGLE_RE = re.compile(r"'[^']{1,20}'")
+_SENTENCE_SPLIT_RE = re.compile(r'[.!?]')
+
+_ASCII_LETTERS = string.ascii_letters.encode('ascii')
+_ASCII_UPPER = string.ascii_uppercase.encode('ascii')
+
+
+def _compile_union(patterns: list) -> re.Pattern:
+    """
+    Fuse a pattern list into one regex scanned in a single pass.
+
+    Each pattern becomes a named group, so ``match.lastgroup`` tells which
+    pattern fired. The alternation sits inside a lookahead: matches are
+    zero-width, so a long pattern like ``\\bif\\b.*\\bthen\\b`` cannot
+    consume text another pattern needs, and scoring stays "one hit per
+    distinct pattern present".
+
+    All lexicon patterns start on a word boundary; that shared ``\\b`` is
+    checked once outside the lookahead so mid-word positions are rejected
+    without trying every alternative.
+    """
+    prefix = ''
+    if all(p.startswith(r'\b') for p in patterns):
+        prefix, patterns = r'\b', [p[2:] for p in patterns]
+    alternation = '|'.join(f'(?P<p{i}>{p})' for i, p in enumerate(patterns))
+    return re.compile(f'{prefix}(?={alternation})')
+
+
+def _count_caps_and_letters(text: str) -> tuple:
+    """
+    Return (uppercase letters, letters) in text.
+
+    Pure-ASCII text, the common case for English posts, is counted in C by
+    deleting letter bytes; anything else (e.g. Norwegian Æ/Ø/Å) falls back to
+    str.isalpha/str.isupper so non-ASCII letters are still counted.
+    """
+    if text.isascii():
+        b = text.encode('ascii')
+        return (len(b) - len(b.translate(None, _ASCII_UPPER)),
+                len(b) - len(b.translate(None, _ASCII_LETTERS)))
+    letters = [c for c in text if c.isalpha()]
+    return sum(map(str.isupper, letters)), len(letters)
+
+
+class _DualRegex:
+    """
+    A compiled str regex plus, if its pattern is pure ASCII, a bytes copy.
+
+    SRE scans bytes faster than str, and on ASCII text ``\\b`` and every
+    literal mean the same in both, so ASCII text (passed as ``text_ascii``)
+    is scanned with the bytes copy. Match offsets are identical either way.
+    """
+
+    __slots__ = ('str_re', 'bytes_re')
+
+    def __init__(self, pattern: re.Pattern):
+        self.str_re = pattern
+        self.bytes_re = re.compile(pattern.pattern.encode('ascii')) if pattern.pattern.isascii() else None
+
+    def finditer(self, text: str, text_ascii: Optional[bytes] = None):
+        """Iterate matches, over text_ascii when given and usable."""
+        if text_ascii is not None and self.bytes_re is not None:
+            return self.bytes_re.finditer(text_ascii)
+        return self.str_re.finditer(text)
+
+    def count(self, text: str, text_ascii: Optional[bytes] = None) -> int:
+        """Number of non-overlapping matches."""
+        if text_ascii is not None and self.bytes_re is not None:
+            return len(self.bytes_re.findall(text_ascii))
+        return len(self.str_re.findall(text))
+
+
+def _ascii_bytes(text: str) -> Optional[bytes]:
+    """text as bytes if it is pure ASCII (bytes regex fast path), else None."""
+    return text.encode('ascii') if text.isascii() else None
+
+
+def _count_distinct(union: _DualRegex, text: str, text_ascii: Optional[bytes] = None) -> int:
+    """Number of distinct patterns from a fused union that occur in text."""
+    return len({m.lastgroup for m in union.finditer(text, text_ascii)})
+
+
+def _sentence_stats(text_lower: str) -> tuple:
+    """
+    Return (sentence count, average words per sentence) of text.
+
+    A piece between [.!?] is a sentence if it has any words, so each piece
+    is split once for its word count instead of being stripped, filtered
+    and split again.
+    """
+    word_counts = [n for n in map(len, map(str.split, _SENTENCE_SPLIT_RE.split(text_lower))) if n]
+    if not word_counts:
+        return 0, 0.0
+    return len(word_counts), sum(word_counts) / len(word_counts)
+
+
+def _bucket_distinct(hits: list, starts: np.ndarray) -> np.ndarray:
+    """
+    Count distinct keys per segment from (key, position) hits.
+
+    Positions index into the joined text of analyze_batch; ``starts`` holds
+    each segment's start offset, so searchsorted maps hits to segments.
+    """
+    if not hits:
+        return np.zeros(len(starts), dtype=np.int64)
+    keys, positions = zip(*hits)
+    segments = np.searchsorted(starts, positions, side='right') - 1
+    distinct = set(zip(segments.tolist(), keys))
+    return np.bincount([seg for seg, _ in distinct], minlength=len(starts))
+
+
+class _WordMatcher:
+    """
+    Counts how many words of a list occur as substrings of a text.
+
+    With ahocorasick_rs installed, all words are found in one pass over the
+    text; overlapping matches are kept so e.g. both 'kan' and 'kanskje' count,
+    exactly as with the plain ``word in text`` checks used otherwise. Without
+    it, presence checks still scan once through an escaped regex alternation.
+    """
+
+    def __init__(self, words: list):
+        self.words = tuple(words)
+        self._automaton = ahocorasick_rs.AhoCorasick(self.words) if ahocorasick_rs else None
+        self._any_re = None if self._automaton else re.compile('|'.join(map(re.escape, self.words)))
+
+    def count(self, text: str) -> int:
+        """Number of distinct words present in text."""
+        if self._automaton is None:
+            return sum(1 for w in self.words if w in text)
+        return len(set(self._automaton.find_matches_as_strings(text, overlapping=True)))
+
+    def any(self, text: str) -> bool:
+        """Whether at least one word is present in text."""
+        if self._automaton is None:
+            return self._any_re.search(text) is not None
+        return bool(self._automaton.find_matches_as_indexes(text))
+
+    def counts(self, joined: str, starts: np.ndarray) -> np.ndarray:
+        """Distinct words present in each segment of a joined text."""
+        if self._automaton is None:
+            hits = []
+            for i, w in enumerate(self.words):
+                pos = joined.find(w)
+                while pos != -1:
+                    hits.append((w, pos))
+                    pos = joined.find(w, pos + 1)
+        else:
+            hits = [(self.words[i], start) for i, start, _ in
+                    self._automaton.find_matches_as_indexes(joined, overlapping=True)]
+        return _bucket_distinct(hits, starts)
+
+
+class _ResponseCache:
+    """
+    On-disk store of API responses keyed by everything that shapes them.
+
+    Lets a rerun with identical agent states replay earlier responses
+    instead of calling the API again. Backed by a single SQLite file.
+
+    Identical prompts are common (e.g. neutral observers in the same
+    state), so the key also counts how often the prompt has been seen
+    this run: the n-th repeat replays the n-th stored response rather
+    than every agent getting the same text.
+    """
+
+    def __init__(self, path: str):
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        self._conn = sqlite3.connect(path)
+        self._conn.execute('CREATE TABLE IF NOT EXISTS responses (key TEXT PRIMARY KEY, content TEXT)')
+        self._conn.commit()
+        self._seen = {}
+
+    def key(self, model: str, system_prompt: str, max_tokens: int, user_message: str) -> str:
+        """Key for the next occurrence of this request in the run."""
+        base = hashlib.sha256(f"{model}|{system_prompt}|{max_tokens}|{user_message}".encode()).hexdigest()
+        occurrence = self._seen.get(base, 0)
+        self._seen[base] = occurrence + 1
+        return f"{base}:{occurrence}"
+
+    def get(self, key: str) -> Optional[str]:
+        """Cached response content, or None."""
+        row = self._conn.execute('SELECT content FROM responses WHERE key = ?', (key,)).fetchone()
+        return row[0] if row else None
+
+    def set(self, key: str, content: str) -> None:
+        """Store a response's cleaned content."""
+        self._conn.execute('INSERT OR REPLACE INTO responses (key, content) VALUES (?, ?)', (key, content))
+        self._conn.commit()
+
+
+@dataclass(frozen=True, slots=True)
+class _TextFeatures:
+    """Values derived once per text at the start of ContentAnalyzer.analyze."""
+    text: str
+    lower: str
+    lower_ascii: Optional[bytes]  # lower as bytes if pure ASCII (regex fast path)
+    exclamations: int
+    questions: int
+    caps: int                     # caps/letters only counted above 10 chars
+    letters: int
+
+    @classmethod
+    def of(cls, text: str) -> "_TextFeatures":
+        lower = text.lower()
+        caps, letters = _count_caps_and_letters(text) if len(text) > 10 else (0, 0)
+        return cls(
+            text=text,
+            lower=lower,
+            lower_ascii=_ascii_bytes(lower),
+            exclamations=text.count('!'),
+            questions=text.count('?'),
+            caps=caps,
+            letters=letters
+        )
+
+
+@dataclass(frozen=True, slots=True)
+class LanguageConfig:
+    """
+    Compiled lexicon of one language: fused regexes and word matchers.
+
+    Built from ContentAnalyzer's word lists on first use of the language
+    (see _load_language) and shared by every analyzer of that language.
+    """
+    confrontational_union: _DualRegex
+    consensus_union: _DualRegex
+    logical_union: _DualRegex
+    you_re: _DualRegex
+    emotional_high: _WordMatcher
+    emotional_medium: _WordMatcher
+    hedges: _WordMatcher
+    acknowledgements: _WordMatcher
+    absolutes: _WordMatcher
+    evidence: _WordMatcher
+    challenge: _WordMatcher
+    imperative_starters: frozenset
 
 
 class ContentAnalyzer:
@@ -88,7 +348,7 @@ class ContentAnalyzer:
     ABSOLUTES_EN = ['always', 'never', 'everyone', 'no one', 'all ', 'none ']
     EVIDENCE_WORDS_EN = ['data', 'study', 'research', 'percent', '%', 'billion']
     CHALLENGE_WORDS_EN = ['really', 'seriously', 'honestly']
-    IMPERATIVE_STARTERS_EN = ['wake', 'stop', 'look', 'think', 'open']
+    IMPERATIVE_STARTERS_EN = frozenset({'wake', 'stop', 'look', 'think', 'open'})
 
     # ===== NORWEGIAN WORD LISTS =====
     EMOTIONAL_WORDS_NO = {
@@ -164,7 +424,15 @@ class ContentAnalyzer:
     ABSOLUTES_NO = ['alltid', 'aldri', 'alle ', 'ingen ', 'ingenting', 'absolutt']
     EVIDENCE_WORDS_NO = ['data', 'studie', 'forskning', 'prosent', '%', 'milliard', 'statistikk']
     CHALLENGE_WORDS_NO = ['virkelig', 'seriøst', 'ærlig talt']
-    IMPERATIVE_STARTERS_NO = ['våkn', 'stopp', 'se', 'tenk', 'åpne']
+    IMPERATIVE_STARTERS_NO = frozenset({'våkn', 'stopp', 'se', 'tenk', 'åpne'})
+
+    # Results shared by all analyzers, keyed by (language, text); posts and
+    # API error fallbacks repeat verbatim often enough to be worth caching
+    _RESULT_CACHE: dict = {}
+    RESULT_CACHE_SIZE = 4096
+
+    # analyze_batch spreads at least this many new texts per worker process
+    PARALLEL_MIN_TEXTS = 1024
 
     def __init__(self, language: str = "en"):
         """
@@ -174,34 +442,7 @@ class ContentAnalyzer:
             language: Language code - "en" for English, "no" for Norwegian
         """
         self.language = language
-        self._set_language_specific_lists()
-
-    def _set_language_specific_lists(self):
-        """Set instance variables based on language."""
-        if self.language == "no":
-            self.EMOTIONAL_WORDS = self.EMOTIONAL_WORDS_NO
-            self.CONFRONTATIONAL_PATTERNS = self.CONFRONTATIONAL_PATTERNS_NO
-            self.CONSENSUS_MARKERS = self.CONSENSUS_MARKERS_NO
-            self.LOGICAL_CONNECTORS = self.LOGICAL_CONNECTORS_NO
-            self.HEDGES = self.HEDGES_NO
-            self.ACKNOWLEDGEMENTS = self.ACKNOWLEDGEMENTS_NO
-            self.ABSOLUTES = self.ABSOLUTES_NO
-            self.EVIDENCE_WORDS = self.EVIDENCE_WORDS_NO
-            self.CHALLENGE_WORDS = self.CHALLENGE_WORDS_NO
-            self.IMPERATIVE_STARTERS = self.IMPERATIVE_STARTERS_NO
-            self.YOU_PATTERN = r'\bdu\b'  # Norwegian "you"
-        else:  # Default to English
-            self.EMOTIONAL_WORDS = self.EMOTIONAL_WORDS_EN
-            self.CONFRONTATIONAL_PATTERNS = self.CONFRONTATIONAL_PATTERNS_EN
-            self.CONSENSUS_MARKERS = self.CONSENSUS_MARKERS_EN
-            self.LOGICAL_CONNECTORS = self.LOGICAL_CONNECTORS_EN
-            self.HEDGES = self.HEDGES_EN
-            self.ACKNOWLEDGEMENTS = self.ACKNOWLEDGEMENTS_EN
-            self.ABSOLUTES = self.ABSOLUTES_EN
-            self.EVIDENCE_WORDS = self.EVIDENCE_WORDS_EN
-            self.CHALLENGE_WORDS = self.CHALLENGE_WORDS_EN
-            self.IMPERATIVE_STARTERS = self.IMPERATIVE_STARTERS_EN
-            self.YOU_PATTERN = r'\byou\b'  # English "you"
+        self.cfg = _load_language(language)
 
     def analyze(self, text: str) -> dict:
         """
@@ -211,140 +452,193 @@ class ContentAnalyzer:
             dict with keys: emotional_intensity, provocativeness,
                            logical_coherence, consensus_orientation
         """
-        text_lower = text.lower()
-
-        # Emotional intensity
-        emotional = self._calculate_emotional_intensity(text, text_lower)
+        key = (self.language, text)
+        cached = self._RESULT_CACHE.get(key)
+        if cached is not None:
+            return dict(cached)
 
-        # Provocativeness
-        provocative = self._calculate_provocativeness(text, text_lower)
+        feat = _TextFeatures.of(text)
+        emotional, provocative, logical, consensus = score_post(*self._features(feat))
 
-        # Logical coherence
-        logical = self._calculate_logical_coherence(text_lower)
-
-        # Consensus orientation
-        consensus = self._calculate_consensus_orientation(text_lower)
-
-        return {
+        metrics = {
             'emotional_intensity': emotional,
             'provocativeness': provocative,
             'logical_coherence': logical,
             'consensus_orientation': consensus
         }
 
-    def _calculate_emotional_intensity(self, text: str, text_lower: str) -> float:
-        """Calculate emotional intensity from text features."""
-        score = 0.0
-
-        # Count exclamation marks (strong signal)
-        exclamations = text.count('!')
-        score += min(exclamations * 0.15, 0.45)
-
-        # Count question marks (rhetorical questions)
-        questions = text.count('?')
-        score += min(questions * 0.08, 0.24)
-
-        # Caps ratio (SHOUTING)
-        if len(text) > 10:
-            caps = sum(1 for c in text if c.isupper() and c.isalpha())
-            letters = sum(1 for c in text if c.isalpha())
-            if letters > 0:
-                caps_ratio = caps / letters
-                if caps_ratio > 0.3:  # Significant caps
-                    score += 0.2
-
-        # High-intensity words
-        for word in self.EMOTIONAL_WORDS['high']:
-            if word in text_lower:
-                score += 0.12
-
-        # Medium-intensity words
-        for word in self.EMOTIONAL_WORDS['medium']:
-            if word in text_lower:
-                score += 0.06
-
-        return min(1.0, score)
-
-    def _calculate_provocativeness(self, text: str, text_lower: str) -> float:
-        """Calculate how confrontational/provocative the text is."""
-        score = 0.0
-
-        # Direct confrontational patterns
-        for pattern in self.CONFRONTATIONAL_PATTERNS:
-            if re.search(pattern, text_lower):
-                score += 0.15
-
-        # "You" statements (direct address, often confrontational)
-        you_count = len(re.findall(self.YOU_PATTERN, text_lower))
-        score += min(you_count * 0.08, 0.24)
+        if len(self._RESULT_CACHE) >= self.RESULT_CACHE_SIZE:
+            self._RESULT_CACHE.clear()
+        self._RESULT_CACHE[key] = metrics
+        return dict(metrics)
 
-        # Scare quotes (dismissive)
-        scare_quotes = len(re.findall(r'"[^"]{1,20}"', text)) + len(re.findall(r"'[^']{1,20}'", text))
-        score += min(scare_quotes * 0.1, 0.2)
-
-        # Rhetorical questions with challenge words
-        if '?' in text and any(w in text_lower for w in self.CHALLENGE_WORDS):
-            score += 0.15
-
-        # Imperative mood starters
-        words = text_lower.split()
-        if words and words[0] in self.IMPERATIVE_STARTERS:
-            score += 0.1
-
-        return min(1.0, score)
-
-    def _calculate_logical_coherence(self, text_lower: str) -> float:
-        """Calculate logical structure of argument."""
-        score = 0.4  # Base score
-
-        # Logical connectors
-        for pattern in self.LOGICAL_CONNECTORS:
-            if re.search(pattern, text_lower):
-                score += 0.1
-
-        # Sentence structure (longer, more structured = higher)
-        sentences = re.split(r'[.!?]', text_lower)
-        sentences = [s.strip() for s in sentences if s.strip()]
-
-        if len(sentences) >= 2:
-            score += 0.1
+    def analyze_batch(self, texts: list) -> list:
+        """
+        Analyze many texts at once; same results as calling analyze on each.
 
-        # Average sentence length (not too short)
-        if sentences:
-            avg_len = sum(len(s.split()) for s in sentences) / len(sentences)
-            if avg_len > 8:
-                score += 0.1
+        Texts are joined with newlines (no lexicon pattern crosses a line
+        break) so each fused regex and word automaton scans once for the
+        whole batch. Hits are bucketed back to their text by offset and the
+        per-text counts are scored together by kernels.score_posts. Large
+        offline batches (PARALLEL_MIN_TEXTS new texts or more per CPU) are
+        split into chunks scored in parallel worker processes.
 
-        # Evidence references
-        if any(w in text_lower for w in self.EVIDENCE_WORDS):
-            score += 0.15
+        Returns:
+            list of metric dicts, in the order of texts
+        """
+        results = {}
+        pending = []
+        for t in dict.fromkeys(texts):
+            cached = self._RESULT_CACHE.get((self.language, t))
+            if cached is not None:
+                results[t] = cached
+            else:
+                pending.append(t)
+
+        if pending:
+            # Regex scanning holds the GIL, so large offline batches are
+            # split across processes rather than threads
+            workers = min(os.cpu_count() or 1, len(pending) // self.PARALLEL_MIN_TEXTS)
+            if workers > 1:
+                size = -(-len(pending) // workers)
+                chunks = [pending[i:i + size] for i in range(0, len(pending), size)]
+                with ProcessPoolExecutor(max_workers=workers) as pool:
+                    scores = np.concatenate(list(pool.map(_score_batch_in_worker, [self.language] * len(chunks), chunks)))
+            else:
+                scores = self._score_batch(pending)
+            results.update(self._store_scores(pending, scores))
+
+        return [dict(results[t]) for t in texts]
+
+    def _score_batch(self, texts: list) -> np.ndarray:
+        """Metrics of texts as an (n, 4) array, columns as in score_post."""
+        cfg = self.cfg
+        n = len(texts)
+        lowers = [t.lower() for t in texts]
+        joined = '\n'.join(lowers)
+        joined_ascii = _ascii_bytes(joined)
+        starts = np.cumsum([0] + [len(t) + 1 for t in lowers[:-1]])
+
+        def distinct(union):
+            return _bucket_distinct([(m.lastgroup, m.start()) for m in union.finditer(joined, joined_ascii)], starts)
+
+        arr = np.array(texts, dtype=str)
+        questions = np.char.count(arr, '?')
+        caps, letters = np.array([_count_caps_and_letters(t) for t in texts], dtype=np.int64).reshape(n, 2).T
+        you_positions = [m.start() for m in cfg.you_re.finditer(joined, joined_ascii)]
+        sentence_stats = [_sentence_stats(t) for t in lowers]
+
+        scores = score_posts(
+            np.char.count(arr, '!'),
+            questions,
+            np.char.str_len(arr),
+            caps,
+            letters,
+            cfg.emotional_high.counts(joined, starts),
+            cfg.emotional_medium.counts(joined, starts),
+            distinct(cfg.confrontational_union),
+            np.bincount(np.searchsorted(starts, you_positions, side='right') - 1, minlength=n),
+            np.array([
+                len(_SCARE_QUOTE_DOUBLE_RE.findall(t)) + len(_SCARE_QUOTE_SINGLE_RE.findall(t))
+                for t in texts
+            ], dtype=np.int64),
+            (questions > 0) & (cfg.challenge.counts(joined, starts) > 0),
+            np.array([bool(w) and w[0] in cfg.imperative_starters
+                      for w in (t.split(None, 1) for t in lowers)], dtype=bool),
+            distinct(cfg.logical_union),
+            np.array([count for count, _ in sentence_stats], dtype=np.int64),
+            np.array([avg for _, avg in sentence_stats], dtype=np.float64),
+            cfg.evidence.counts(joined, starts) > 0,
+            distinct(cfg.consensus_union),
+            cfg.hedges.counts(joined, starts),
+            cfg.acknowledgements.counts(joined, starts) > 0,
+            cfg.absolutes.counts(joined, starts)
+        )
 
-        return min(1.0, score)
+        return scores
+
+    def _store_scores(self, texts: list, scores: np.ndarray) -> dict:
+        """Turn score rows into metric dicts, cache them, and return text -> dict."""
+        results = {
+            text: {
+                'emotional_intensity': e,
+                'provocativeness': p,
+                'logical_coherence': l,
+                'consensus_orientation': c
+            }
+            for text, (e, p, l, c) in zip(texts, scores.tolist())
+        }
+        if len(results) <= self.RESULT_CACHE_SIZE:
+            if len(self._RESULT_CACHE) + len(results) > self.RESULT_CACHE_SIZE:
+                self._RESULT_CACHE.clear()
+            for text, metrics in results.items():
+                self._RESULT_CACHE[(self.language, text)] = metrics
+        return results
+
+    def _features(self, feat: _TextFeatures) -> tuple:
+        """Lexical counts of one text, in score_post argument order."""
+        cfg = self.cfg
+        lower, lower_ascii = feat.lower, feat.lower_ascii
+        words = lower.split(None, 1)
+        sentence_count, avg_sentence_len = _sentence_stats(lower)
+        return (
+            feat.exclamations,
+            feat.questions,
+            len(feat.text),
+            feat.caps,
+            feat.letters,
+            cfg.emotional_high.count(lower),
+            cfg.emotional_medium.count(lower),
+            _count_distinct(cfg.confrontational_union, lower, lower_ascii),
+            cfg.you_re.count(lower, lower_ascii),
+            len(_SCARE_QUOTE_DOUBLE_RE.findall(feat.text)) + len(_SCARE_QUOTE_SINGLE_RE.findall(feat.text)),
+            feat.questions > 0 and cfg.challenge.any(lower),
+            bool(words) and words[0] in cfg.imperative_starters,
+            _count_distinct(cfg.logical_union, lower, lower_ascii),
+            sentence_count,
+            avg_sentence_len,
+            cfg.evidence.any(lower),
+            _count_distinct(cfg.consensus_union, lower, lower_ascii),
+            cfg.hedges.count(lower),
+            cfg.acknowledgements.any(lower),
+            cfg.absolutes.count(lower)
+        )
 
-    def _calculate_consensus_orientation(self, text_lower: str) -> float:
-        """Calculate how cooperative/consensus-seeking the text is."""
-        score = 0.3  # Base score
 
-        # Consensus markers
-        for pattern in self.CONSENSUS_MARKERS:
-            if re.search(pattern, text_lower):
-                score += 0.12
+@functools.lru_cache(maxsize=None)
+def _load_language(language: str) -> LanguageConfig:
+    """Compile the lexicon for a language ("no", anything else is English)."""
+    suffix = 'NO' if language == 'no' else 'EN'
+    lists = {name: getattr(ContentAnalyzer, f'{name}_{suffix}') for name in (
+        'EMOTIONAL_WORDS', 'CONFRONTATIONAL_PATTERNS', 'CONSENSUS_MARKERS', 'LOGICAL_CONNECTORS',
+        'HEDGES', 'ACKNOWLEDGEMENTS', 'ABSOLUTES', 'EVIDENCE_WORDS', 'CHALLENGE_WORDS',
+        'IMPERATIVE_STARTERS'
+    )}
+    return LanguageConfig(
+        confrontational_union=_DualRegex(_compile_union(lists['CONFRONTATIONAL_PATTERNS'])),
+        consensus_union=_DualRegex(_compile_union(lists['CONSENSUS_MARKERS'])),
+        logical_union=_DualRegex(_compile_union(lists['LOGICAL_CONNECTORS'])),
+        you_re=_DualRegex(re.compile(r'\bdu\b' if suffix == 'NO' else r'\byou\b')),
+        emotional_high=_WordMatcher(lists['EMOTIONAL_WORDS']['high']),
+        emotional_medium=_WordMatcher(lists['EMOTIONAL_WORDS']['medium']),
+        hedges=_WordMatcher(lists['HEDGES']),
+        acknowledgements=_WordMatcher(lists['ACKNOWLEDGEMENTS']),
+        absolutes=_WordMatcher(lists['ABSOLUTES']),
+        evidence=_WordMatcher(lists['EVIDENCE_WORDS']),
+        challenge=_WordMatcher(lists['CHALLENGE_WORDS']),
+        imperative_starters=lists['IMPERATIVE_STARTERS']
+    )
 
-        # Hedging language (nuanced, not absolute)
-        for hedge in self.HEDGES:
-            if hedge in text_lower:
-                score += 0.05
 
-        # Acknowledging other side
-        if any(phrase in text_lower for phrase in self.ACKNOWLEDGEMENTS):
-            score += 0.15
+@functools.lru_cache(maxsize=4)
+def _get_analyzer(language: str) -> ContentAnalyzer:
+    """Shared ContentAnalyzer per language (analyzers hold no per-post state)."""
+    return ContentAnalyzer(language=language)
 
-        # Negative for absolute language
-        for absolute in self.ABSOLUTES:
-            if absolute in text_lower:
-                score -= 0.08
 
-        return max(0.0, min(1.0, score))
+def _score_batch_in_worker(language: str, texts: list) -> np.ndarray:
+    """Process-pool entry point for ContentAnalyzer.analyze_batch."""
+    return _get_analyzer(language)._score_batch(texts)
 
 
 class LLMAgent:
@@ -356,7 +650,23 @@ class LLMAgent:
     recent posts.
     """
 
-    def __init__(self, api_key: str, model: str = "claude-sonnet-4-20250514", language: str = "en"):
+    USER_MESSAGE = "Write your post now."
+
+    # Retry schedule for rate limits, dropped connections and server errors
+    MAX_ATTEMPTS = 3
+    RETRY_BASE_DELAY = 10.0  # seconds, doubled on each retry
+
+    # Response cache location (only used with use_cache=True)
+    CACHE_PATH = os.path.join('.cache', 'claude', 'responses.sqlite')
+
+    def __init__(
+        self,
+        api_key: str,
+        model: str = "claude-sonnet-4-20250514",
+        language: str = "en",
+        concurrency: int = 5,
+        use_cache: bool = False
+    ):
         """
         Initialize the LLM agent handler.
 
@@ -364,29 +674,41 @@ class LLMAgent:
             api_key: Anthropic API key
             model: Model to use for generation
             language: Language code - "en" for English, "no" for Norwegian
+            concurrency: Max simultaneous API calls in generate_posts_batch
+            use_cache: Replay responses for previously seen prompts from an
+                       on-disk cache (for reproducible reruns)
         """
+        # Imported here so analysis-only use of this module skips the SDK import
+        import anthropic
         self.client = anthropic.Anthropic(api_key=api_key)
+        self.api_key = api_key
         self.model = model
         self.language = language
-        self.analyzer = ContentAnalyzer(language=language)
-
-    def generate_post(
-        self,
-        agent: Agent,
-        topic: str,
-        max_tokens: int = 80  # ~280 characters, tweet-length
-    ) -> Post:
-        """
-        Generate a post from an agent based on their state.
-
-        Args:
-            agent: The agent generating the post
-            topic: The debate topic
-            max_tokens: Maximum tokens for response (~80 tokens ≈ 280 chars)
-
-        Returns:
-            Post object with content and analyzed metrics
-        """
+        self.concurrency = concurrency
+        self.analyzer = _get_analyzer(language)
+        self.cache = _ResponseCache(self.CACHE_PATH) if use_cache else None
+
+        # Event loop, async client and semaphore for generate_posts_batch.
+        # Kept across rounds so the client's connection pool is reused;
+        # created on first use and released by close()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._async_client: Optional["anthropic.AsyncAnthropic"] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+
+    def _cache_lookup(self, system_prompt: str, max_tokens: int) -> tuple:
+        """(cache key, cached content or None); (None, None) if caching is off."""
+        if self.cache is None:
+            return None, None
+        key = self.cache.key(self.model, system_prompt, max_tokens, self.USER_MESSAGE)
+        return key, self.cache.get(key)
+
+    def _cache_store(self, key: Optional[str], content: str) -> None:
+        """Save successful response content under key (no-op without a cache)."""
+        if key is not None:
+            self.cache.set(key, content)
+
+    def _build_system_prompt(self, agent: Agent) -> str:
+        """Fill the agent's role template with its current state."""
         # Get appropriate prompt template
         template = get_system_prompt(agent.role.name)
 
@@ -394,37 +716,31 @@ class LLMAgent:
         emotion_desc = agent.emotional_state.to_description()
         opinion_desc = agent.opinion.to_description() if agent.role == AgentRole.NEUTRAL_OBSERVER else ""
 
-        system_prompt = format_prompt(
+        return format_prompt(
             template,
             emotion_description=emotion_desc,
             memory=agent.memory,
             opinion_description=opinion_desc
         )
 
-        # Call Claude API
-        try:
-            response = self.client.messages.create(
-                model=self.model,
-                max_tokens=max_tokens,
-                system=system_prompt,
-                messages=[{"role": "user", "content": "Write your post now."}]
-            )
+    @staticmethod
+    def _clean_content(text: str) -> str:
+        """Strip quotes and any accidental name prefix from a response."""
+        content = text.strip()
 
-            content = response.content[0].text.strip()
+        # Clean up any markdown artifacts
+        content = content.strip('"\'')
+        if content.startswith('[') and ']:' in content:
+            # Remove any accidental name prefix
+            content = content.split(']:', 1)[-1].strip()
 
-            # Clean up any markdown artifacts
-            content = content.strip('"\'')
-            if content.startswith('[') and ']:' in content:
-                # Remove any accidental name prefix
-                content = content.split(']:', 1)[-1].strip()
-
-        except Exception as e:
-            # Fallback content on API error
-            content = f"[API Error: {str(e)[:50]}]"
-            print(f"Warning: API call failed for agent {agent.id}: {e}")
+        return content
 
+    def _make_post(self, agent: Agent, content: str, metrics: Optional[dict] = None) -> Post:
+        """Analyze content, build the Post and record the author's metrics."""
         # Analyze the content
-        metrics = self.analyzer.analyze(content)
+        if metrics is None:
+            metrics = self.analyzer.analyze(content)
 
         # Create post object
         post = Post(
@@ -447,6 +763,240 @@ class LLMAgent:
 
         return post
 
+    def _make_posts(self, agents: List[Agent], contents: List[str]) -> List[Post]:
+        """Build one Post per agent, analyzing all contents in one batch."""
+        metrics = self.analyzer.analyze_batch(contents)
+        return [self._make_post(agent, content, m) for agent, content, m in zip(agents, contents, metrics)]
+
+    def generate_post(
+        self,
+        agent: Agent,
+        topic: str,
+        max_tokens: int = 80  # ~280 characters, tweet-length
+    ) -> Post:
+        """
+        Generate a post from an agent based on their state.
+
+        Args:
+            agent: The agent generating the post
+            topic: The debate topic
+            max_tokens: Maximum tokens for response (~80 tokens ≈ 280 chars)
+
+        Returns:
+            Post object with content and analyzed metrics
+        """
+        system_prompt = self._build_system_prompt(agent)
+
+        cache_key, cached = self._cache_lookup(system_prompt, max_tokens)
+        if cached is not None:
+            return self._make_post(agent, cached)
+
+        import anthropic
+
+        # Call Claude API, collecting the text as it streams in
+        try:
+            for attempt in range(self.MAX_ATTEMPTS):
+                try:
+                    with self.client.messages.stream(
+                        model=self.model,
+                        max_tokens=max_tokens,
+                        system=system_prompt,
+                        messages=[{"role": "user", "content": self.USER_MESSAGE}]
+                    ) as stream:
+                        text_parts = list(stream.text_stream)
+                    break
+                except (anthropic.RateLimitError, anthropic.APIConnectionError,
+                        anthropic.InternalServerError):
+                    if attempt == self.MAX_ATTEMPTS - 1:
+                        raise
+                    time.sleep(self.RETRY_BASE_DELAY * 2 ** attempt)
+            content = self._clean_content(''.join(text_parts))
+            self._cache_store(cache_key, content)
+
+        except Exception as e:
+            # Fallback content on API error
+            content = f"[API Error: {str(e)[:50]}]"
+            print(f"Warning: API call failed for agent {agent.id}: {e}")
+
+        return self._make_post(agent, content)
+
+    async def _agenerate_content(
+        self,
+        client: "anthropic.AsyncAnthropic",
+        semaphore: asyncio.Semaphore,
+        agent: Agent,
+        topic: str,
+        max_tokens: int = 80
+    ) -> str:
+        """Async counterpart of generate_post's API call, retrying on rate limits."""
+        import anthropic
+        system_prompt = self._build_system_prompt(agent)
+
+        cache_key, cached = self._cache_lookup(system_prompt, max_tokens)
+        if cached is not None:
+            return cached
+
+        try:
+            for attempt in range(self.MAX_ATTEMPTS):
+                try:
+                    async with semaphore:
+                        response = await client.messages.create(
+                            model=self.model,
+                            max_tokens=max_tokens,
+                            system=system_prompt,
+                            messages=[{"role": "user", "content": self.USER_MESSAGE}]
+                        )
+                    break
+                except (anthropic.RateLimitError, anthropic.APIConnectionError,
+                        anthropic.InternalServerError):
+                    if attempt == self.MAX_ATTEMPTS - 1:
+                        raise
+                    # Back off outside the semaphore so other agents can proceed
+                    await asyncio.sleep(self.RETRY_BASE_DELAY * 2 ** attempt)
+            content = self._clean_content(response.content[0].text)
+            self._cache_store(cache_key, content)
+
+        except Exception as e:
+            # Fallback content on API error
+            content = f"[API Error: {str(e)[:50]}]"
+            print(f"Warning: API call failed for agent {agent.id}: {e}")
+
+        return content
+
+    async def _agenerate_contents(self, agents: List[Agent], topic: str, max_tokens: int) -> List[str]:
+        """Fan out one request per agent, at most `concurrency` in flight."""
+        # Client and semaphore are bound to the event loop, so they are
+        # created inside it (the loop itself lives until close())
+        if self._async_client is None:
+            import anthropic
+            self._async_client = anthropic.AsyncAnthropic(api_key=self.api_key)
+            self._semaphore = asyncio.Semaphore(self.concurrency)
+        return await asyncio.gather(*[
+            self._agenerate_content(self._async_client, self._semaphore, agent, topic, max_tokens)
+            for agent in agents
+        ])
+
+    def generate_posts_batch(
+        self,
+        agents: List[Agent],
+        topic: str,
+        max_tokens: int = 80
+    ) -> List[Post]:
+        """
+        Generate one post per agent with concurrent API calls.
+
+        Equivalent to calling generate_post for each agent in turn (agent
+        states are only read, never changed, while posts are generated),
+        but round latency is set by the slowest call rather than the sum.
+
+        Args:
+            agents: Agents posting this round
+            topic: The debate topic
+            max_tokens: Maximum tokens per response
+
+        Returns:
+            Posts in the same order as agents
+        """
+        if not agents:
+            return []
+        if self._loop is None:
+            self._loop = asyncio.new_event_loop()
+        contents = self._loop.run_until_complete(
+            self._agenerate_contents(agents, topic, max_tokens)
+        )
+        return self._make_posts(agents, contents)
+
+    def close(self) -> None:
+        """Close the async client and its event loop (recreated on next use)."""
+        if self._loop is None:
+            return
+        if self._async_client is not None:
+            self._loop.run_until_complete(self._async_client.close())
+        self._loop.close()
+        self._loop = None
+        self._async_client = None
+        self._semaphore = None
+
+    def generate_posts_via_batch(
+        self,
+        agents: List[Agent],
+        topic: str,
+        max_tokens: int = 80,
+        poll_interval: float = 5.0
+    ) -> List[Post]:
+        """
+        Generate one post per agent through the Message Batches API.
+
+        All prompts are submitted as a single batch job, which is polled
+        until it ends. Batches are cheaper than individual calls but can
+        take minutes to complete, so this suits offline runs only; the
+        interactive path (generate_posts_batch) remains the default.
+
+        Args:
+            agents: Agents posting this round
+            topic: The debate topic
+            max_tokens: Maximum tokens per response
+            poll_interval: Seconds between batch status checks
+
+        Returns:
+            Posts in the same order as agents
+        """
+        if not agents:
+            return []
+
+        system_prompts = {str(agent.id): self._build_system_prompt(agent) for agent in agents}
+
+        texts = {}
+        cache_keys = {}
+        for custom_id, system_prompt in system_prompts.items():
+            cache_keys[custom_id], cached = self._cache_lookup(system_prompt, max_tokens)
+            if cached is not None:
+                texts[custom_id] = cached
+
+        requests = [
+            {
+                "custom_id": custom_id,
+                "params": {
+                    "model": self.model,
+                    "max_tokens": max_tokens,
+                    "system": system_prompt,
+                    "messages": [{"role": "user", "content": self.USER_MESSAGE}]
+                }
+            }
+            for custom_id, system_prompt in system_prompts.items()
+            if custom_id not in texts
+        ]
+
+        try:
+            if requests:
+                batch = self.client.messages.batches.create(requests=requests)
+                while batch.processing_status != "ended":
+                    time.sleep(poll_interval)
+                    batch = self.client.messages.batches.retrieve(batch.id)
+
+                for entry in self.client.messages.batches.results(batch.id):
+                    if entry.result.type == "succeeded":
+                        content = self._clean_content(entry.result.message.content[0].text)
+                        self._cache_store(cache_keys[entry.custom_id], content)
+                    else:
+                        content = f"[API Error: batch request {entry.result.type}]"
+                    texts[entry.custom_id] = content
+
+        except Exception as e:
+            print(f"Warning: batch submission failed: {e}")
+            error = f"[API Error: {str(e)[:50]}]"
+            for request in requests:
+                texts.setdefault(request["custom_id"], error)
+
+        contents = []
+        for agent in agents:
+            content = texts.get(str(agent.id))
+            if content is None:
+                content = "[API Error: missing batch result]"
+                print(f"Warning: no batch result for agent {agent.id}")
+            contents.append(content)
+        return self._make_posts(agents, contents)
+
 
 def create_test_post(agent: Agent, content: str, language: str = "en") -> Post:
     """
@@ -460,8 +1010,7 @@ def create_test_post(agent: Agent, content: str, language: str = "en") -> Post:
     Returns:
         Post object with analyzed metrics
     """
-    analyzer = ContentAnalyzer(language=language)
-    metrics = analyzer.analyze(content)
+    metrics = _get_analyzer(language).analyze(content)
 
     return Post(
         author_id=agent.id,
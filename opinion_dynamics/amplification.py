@@ -6,8 +6,72 @@ creating feedback loops that advantage controversial positions.
 """
 
 import random
-from typing import List, Tuple
+import numpy as np
+from typing import Iterable, List, Optional, Tuple, Union
 from models import Post, Agent, SimulationConfig
+from kernels import visibility
+
+
+class PostBatch:
+    """
+    Append-only post collection with its feed features stored as arrays.
+
+    Keeps the posts in order (iteration, indexing and len work as for a
+    list) alongside contiguous float64 columns of the content features the
+    visibility formula reads, so feed scoring does not walk every post's
+    attributes each round. Posts must not be modified after being added.
+    """
+
+    def __init__(self, posts: Iterable[Post] = ()):
+        self.posts: List[Post] = []
+        self._columns = np.empty((4, 16))  # emotional, provocative, engagement, round
+        self.extend(posts)
+
+    def append(self, post: Post) -> None:
+        """Add a single post."""
+        self.extend((post,))
+
+    def extend(self, posts: Iterable[Post]) -> None:
+        """Add posts, growing the columns by doubling when full."""
+        posts = list(posts)
+        start = len(self.posts)
+        end = start + len(posts)
+        capacity = self._columns.shape[1]
+        if end > capacity:
+            while capacity < end:
+                capacity *= 2
+            grown = np.empty((4, capacity))
+            grown[:, :start] = self._columns[:, :start]
+            self._columns = grown
+        self._columns[:, start:end] = np.array(
+            [(p.emotional_intensity, p.provocativeness, p.engagement, p.round_num) for p in posts]
+        ).T.reshape(4, len(posts))
+        self.posts.extend(posts)
+
+    @property
+    def emotional_intensity(self) -> np.ndarray:
+        return self._columns[0, :len(self.posts)]
+
+    @property
+    def provocativeness(self) -> np.ndarray:
+        return self._columns[1, :len(self.posts)]
+
+    @property
+    def engagement(self) -> np.ndarray:
+        return self._columns[2, :len(self.posts)]
+
+    @property
+    def round_num(self) -> np.ndarray:
+        return self._columns[3, :len(self.posts)]
+
+    def __len__(self) -> int:
+        return len(self.posts)
+
+    def __iter__(self):
+        return iter(self.posts)
+
+    def __getitem__(self, index):
+        return self.posts[index]
 
 
 class AmplificationAlgorithm:
@@ -22,18 +86,28 @@ class AmplificationAlgorithm:
     provocative → more visible → more exposure → more influence → more provocation
     """
 
-    def __init__(self, config: SimulationConfig):
+    def __init__(self, config: SimulationConfig, rng: Optional[np.random.Generator] = None):
         """
         Initialize with configuration weights.
 
         Args:
-            config: Simulation config with amplification weights
+            config: Simulation config with amplification weights and seed
+            rng: Generator for feed noise and sampling (default: one seeded
+                 from config.seed, or from the random module if that is None)
         """
         self.emotion_weight = config.emotion_weight
         self.provocative_weight = config.provocative_weight
         self.recency_weight = config.recency_weight
 
-    def compute_visibility(self, post: Post, current_round: int) -> float:
+        # Random source for feed noise and sampling keys (drawn as whole
+        # arrays). Without a seed it is seeded from the random module, so
+        # random.seed() alone still makes a run reproducible
+        if rng is None:
+            seed = config.seed if config.seed is not None else random.getrandbits(64)
+            rng = np.random.default_rng(seed)
+        self.rng = rng
+
+    def compute_visibility(self, post: Post, current_round: int, noise: Optional[float] = None) -> float:
         """
         Compute visibility score for a post.
 
@@ -45,30 +119,59 @@ class AmplificationAlgorithm:
         Args:
             post: The post to score
             current_round: Current simulation round
+            noise: Pre-drawn noise factor in [0.95, 1.05] (drawn here if None)
 
         Returns:
             Visibility score (0.0 to ~2.0, can exceed 1.0 for viral content)
         """
+        # Small random factor (algorithmic noise)
+        if noise is None:
+            noise = float(self.rng.uniform(0.95, 1.05))
+
+        # Engagement boost inside the kernel is the key feedback mechanism
+        # that advantages provocative content
+        return visibility(
+            post.emotional_intensity, post.provocativeness,
+            max(0, current_round - post.round_num), post.engagement, noise,
+            self.emotion_weight, self.provocative_weight, self.recency_weight
+        )
+
+    def compute_visibilities(self, posts: Union[List[Post], PostBatch], current_round: int) -> np.ndarray:
+        """
+        Compute visibility scores for many posts at once.
+
+        Same formula as compute_visibility, evaluated with NumPy over
+        arrays of post features; each post's visibility_score is updated.
+
+        Args:
+            posts: Posts to score (a PostBatch avoids re-gathering features)
+            current_round: Current simulation round
+
+        Returns:
+            Array of visibility scores, aligned with posts
+        """
+        batch = posts if isinstance(posts, PostBatch) else PostBatch(posts)
+        n = len(batch)
+        emotional = batch.emotional_intensity
+        provocative = batch.provocativeness
+        engagement = batch.engagement
+        rounds = batch.round_num
+
         # Recency decay: newer posts score higher
-        rounds_old = max(0, current_round - post.round_num)
-        recency_score = 1.0 / (1.0 + rounds_old * 0.25)
+        recency = 1.0 / (1.0 + np.maximum(0, current_round - rounds) * 0.25)
 
-        # Base visibility from content features
         base_visibility = (
-            self.emotion_weight * post.emotional_intensity +
-            self.provocative_weight * post.provocativeness +
-            self.recency_weight * recency_score
+            self.emotion_weight * emotional +
+            self.provocative_weight * provocative +
+            self.recency_weight * recency
         )
-
-        # Engagement boost: highly engaging content gets exponential amplification
-        # This is the key feedback mechanism that advantages provocative content
-        engagement = post.engagement_potential()
         engagement_boost = 1.0 + (engagement ** 2) * 0.6
+        noise = self.rng.uniform(0.95, 1.05, n)  # one draw for the whole feed
 
-        # Small random factor (algorithmic noise)
-        noise = random.uniform(0.95, 1.05)
-
-        return base_visibility * engagement_boost * noise
+        scores = base_visibility * engagement_boost * noise
+        for post, score in zip(batch.posts, scores.tolist()):
+            post.visibility_score = score
+        return scores
 
     def rank_feed(self, posts: List[Post], current_round: int) -> List[Post]:
         """
@@ -81,10 +184,8 @@ class AmplificationAlgorithm:
         Returns:
             Posts sorted by visibility (highest first)
         """
-        for post in posts:
-            post.visibility_score = self.compute_visibility(post, current_round)
-
-        return sorted(posts, key=lambda p: p.visibility_score, reverse=True)
+        scores = self.compute_visibilities(posts, current_round)
+        return [posts[i] for i in np.argsort(-scores, kind='stable')]
 
     def sample_visible_posts(
         self,
@@ -110,31 +211,20 @@ class AmplificationAlgorithm:
             return []
 
         if len(posts) <= sample_size:
-            return posts
+            return list(posts)
 
         # Compute visibility scores
-        ranked = self.rank_feed(posts, current_round)
-
-        # Weighted sampling without replacement
-        weights = [p.visibility_score + 0.1 for p in ranked]  # +0.1 floor
-        selected = []
-        remaining = list(zip(ranked, weights))
-
-        for _ in range(min(sample_size, len(remaining))):
-            total = sum(w for _, w in remaining)
-            if total <= 0:
-                break
+        scores = self.compute_visibilities(posts, current_round)
 
-            r = random.random() * total
-            cumsum = 0
-            for i, (post, weight) in enumerate(remaining):
-                cumsum += weight
-                if r <= cumsum:
-                    selected.append(post)
-                    remaining.pop(i)
-                    break
-
-        return selected
+        # Weighted sampling without replacement (Efraimidis-Spirakis A-Res):
+        # each post gets key log(U) / weight and the largest keys are kept.
+        # Same selection probabilities and order as repeatedly drawing in
+        # proportion to weight and removing the drawn post, in one pass.
+        keys = np.log1p(-self.rng.random(len(posts))) / (scores + 0.1)  # +0.1 floor
+        # Partial selection of the top sample_size keys; only those get sorted
+        top = np.argpartition(-keys, sample_size - 1)[:sample_size]
+        top = top[np.argsort(-keys[top], kind='stable')]
+        return [posts[i] for i in top.tolist()]
 
 
 def compute_opinion_influence(
@@ -153,19 +243,9 @@ def compute_opinion_influence(
     Returns:
         Tuple of (influence_direction, influence_strength, is_contrarian_source)
     """
-    # Infer post's position from content characteristics
-    # High provocativeness suggests contrarian position
-    # High consensus orientation suggests mainstream position
-    if post.provocativeness > 0.5 and post.provocativeness > post.consensus_orientation:
-        post_position = -0.7 - (post.provocativeness * 0.3)  # More provocative = more extreme
-        is_contrarian = True
-    elif post.consensus_orientation > 0.5:
-        post_position = 0.5 + (post.consensus_orientation * 0.3)
-        is_contrarian = False
-    else:
-        # Mixed/neutral post
-        post_position = 0.0
-        is_contrarian = False
+    # Post's position is inferred from its content metrics when it is built
+    post_position = post.inferred_position
+    is_contrarian = post.is_contrarian
 
     # Direction of influence (toward post's position)
     influence_direction = post_position - reader_position
@@ -195,18 +275,23 @@ def analyze_amplification_bias(posts: List[Post]) -> dict:
     Returns:
         Dict with bias analysis metrics
     """
-    contrarian_posts = [p for p in posts if p.provocativeness > 0.5]
-    consensus_posts = [p for p in posts if p.consensus_orientation > 0.5]
-    neutral_posts = [p for p in posts if p.provocativeness <= 0.5 and p.consensus_orientation <= 0.5]
+    n = len(posts)
+    provocative = np.fromiter((p.provocativeness for p in posts), float, n)
+    consensus = np.fromiter((p.consensus_orientation for p in posts), float, n)
+    visibility_scores = np.fromiter((p.visibility_score for p in posts), float, n)
+
+    contrarian_mask = provocative > 0.5
+    consensus_mask = consensus > 0.5
+    neutral_mask = ~contrarian_mask & ~consensus_mask
 
-    def avg_visibility(post_list):
-        if not post_list:
+    def avg_visibility(mask):
+        if not mask.any():
             return 0.0
-        return sum(p.visibility_score for p in post_list) / len(post_list)
+        return float(visibility_scores[mask].mean())
 
-    contrarian_avg = avg_visibility(contrarian_posts)
-    consensus_avg = avg_visibility(consensus_posts)
-    neutral_avg = avg_visibility(neutral_posts)
+    contrarian_avg = avg_visibility(contrarian_mask)
+    consensus_avg = avg_visibility(consensus_mask)
+    neutral_avg = avg_visibility(neutral_mask)
 
     # Calculate bias ratio
     if consensus_avg > 0:
@@ -215,9 +300,9 @@ def analyze_amplification_bias(posts: List[Post]) -> dict:
         bias_ratio = float('inf') if contrarian_avg > 0 else 1.0
 
     return {
-        "contrarian_posts_count": len(contrarian_posts),
-        "consensus_posts_count": len(consensus_posts),
-        "neutral_posts_count": len(neutral_posts),
+        "contrarian_posts_count": int(contrarian_mask.sum()),
+        "consensus_posts_count": int(consensus_mask.sum()),
+        "neutral_posts_count": int(neutral_mask.sum()),
         "contrarian_avg_visibility": contrarian_avg,
         "consensus_avg_visibility": consensus_avg,
         "neutral_avg_visibility": neutral_avg,
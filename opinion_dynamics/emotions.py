@@ -8,14 +8,25 @@ Models human-like emotional responses to debate content including:
 - Backlash effects
 """
 
+import numpy as np
 from dataclasses import dataclass
-from typing import Tuple
+from typing import List, Tuple
 from models import EmotionalState, Post, Agent
+from kernels import emotional_impact, feed_impacts
 
 
-@dataclass
+# (arousal_delta, anger_delta, valence_delta, engagement_delta, trust_delta)
+ImpactDeltas = Tuple[float, float, float, float, float]
+
+
+@dataclass(slots=True)
 class EmotionalImpact:
-    """Result of processing a post's emotional impact on a reader."""
+    """
+    Result of processing a post's emotional impact on a reader.
+
+    Named form of the ImpactDeltas tuple the engine passes around
+    (EmotionalImpact(*deltas)), for inspection and logging.
+    """
     arousal_delta: float = 0.0
     anger_delta: float = 0.0
     valence_delta: float = 0.0
@@ -42,7 +53,7 @@ class EmotionalEngine:
         post: Post,
         reader: Agent,
         opinion_alignment: float
-    ) -> EmotionalImpact:
+    ) -> ImpactDeltas:
         """
         Calculate how a post affects a reader's emotional state.
 
@@ -52,79 +63,131 @@ class EmotionalEngine:
             opinion_alignment: How aligned their opinions are (-1 to +1)
 
         Returns:
-            EmotionalImpact with deltas to apply
+            Tuple of deltas to apply, in EmotionalImpact field order
         """
-        impact = EmotionalImpact()
-
-        # Base emotional contagion from post intensity
-        impact.arousal_delta = post.emotional_intensity * self.CONTAGION_RATE
-
-        # Provocation effects
-        if post.provocativeness > self.PROVOCATION_THRESHOLD:
-            # Disagreement with provocative content causes anger
-            if opinion_alignment < 0:  # They disagree with post
-                anger_increase = post.provocativeness * abs(opinion_alignment) * 0.5
-                impact.anger_delta = anger_increase
-                impact.valence_delta = -post.provocativeness * 0.3
-
-                # Extreme provocation may reduce trust in author
-                if post.provocativeness > self.EXTREME_PROVOCATION:
-                    impact.trust_delta = -0.15
-            else:
-                # Agreement with provocative content validates and energizes
-                impact.engagement_delta = post.provocativeness * 0.3
-                impact.valence_delta = post.provocativeness * 0.1
-
-        # Agreeable/consensus-oriented content
-        if post.consensus_orientation > 0.6:
-            if opinion_alignment > 0:  # They agree with post
-                impact.arousal_delta -= 0.1  # Calming effect
-                impact.valence_delta += 0.15
-                impact.trust_delta += 0.05
-            else:
-                # Disagreement with reasonable content is less inflammatory
-                impact.arousal_delta += 0.05
-
-        # Engagement always increases when reading (they're paying attention)
-        impact.engagement_delta += 0.1 * post.emotional_intensity
-
-        return impact
-
-    def apply_impact(self, agent: Agent, impact: EmotionalImpact, author_id: str) -> None:
-        """Apply emotional impact to an agent."""
+        return emotional_impact(
+            post.emotional_intensity, post.provocativeness,
+            post.consensus_orientation, opinion_alignment,
+            self.PROVOCATION_THRESHOLD, self.EXTREME_PROVOCATION,
+            self.CONTAGION_RATE
+        )
+
+    def apply_impact(self, agent: Agent, impact: ImpactDeltas, author_id: str) -> None:
+        """Apply emotional impact deltas to an agent."""
+        arousal_delta, anger_delta, valence_delta, engagement_delta, trust_delta = impact
         state = agent.emotional_state
 
-        state.arousal = max(0.0, min(1.0, state.arousal + impact.arousal_delta))
-        state.anger = max(0.0, min(1.0, state.anger + impact.anger_delta))
-        state.valence = max(-1.0, min(1.0, state.valence + impact.valence_delta))
-        state.engagement = max(0.0, min(1.0, state.engagement + impact.engagement_delta))
+        # Clamp with conditional expressions rather than max(min(...)):
+        # same result without two builtin calls per field
+        arousal = state.arousal + arousal_delta
+        state.arousal = 0.0 if arousal < 0.0 else 1.0 if arousal > 1.0 else arousal
+        anger = state.anger + anger_delta
+        state.anger = 0.0 if anger < 0.0 else 1.0 if anger > 1.0 else anger
+        valence = state.valence + valence_delta
+        state.valence = -1.0 if valence < -1.0 else 1.0 if valence > 1.0 else valence
+        engagement = state.engagement + engagement_delta
+        state.engagement = 0.0 if engagement < 0.0 else 1.0 if engagement > 1.0 else engagement
 
         # Update trust in author
-        if impact.trust_delta != 0:
-            agent.update_trust(author_id, impact.trust_delta)
+        if trust_delta != 0:
+            agent.update_trust(author_id, trust_delta)
+
+    def apply_feed(self, readers: List[Agent], posts: List[Post]) -> None:
+        """
+        Apply a whole feed's emotional impact to readers at once.
+
+        Equivalent to process_post_for_reader + apply_impact for every
+        reader and post in order (skipping readers' own posts), but the
+        arithmetic runs in one kernel, parallel across readers. Only valid
+        for readers whose opinion does not move while reading the feed.
+
+        Args:
+            readers: Agents reading the feed
+            posts: The feed, in reading order
+        """
+        if not readers or not posts:
+            return
+
+        states = np.array([
+            (r.emotional_state.arousal, r.emotional_state.anger,
+             r.emotional_state.valence, r.emotional_state.engagement)
+            for r in readers
+        ]).T.copy()
+        positions = np.array([r.opinion.position for r in readers])
+        reads = np.array([[p.author_id != r.id for p in posts] for r in readers])
+
+        # Dense reader-by-author trust for the feed's authors
+        authors = list(dict.fromkeys(p.author_id for p in posts))
+        author_column = {author_id: k for k, author_id in enumerate(authors)}
+        trust = np.array([[r.get_trust(author_id) for author_id in authors] for r in readers])
+
+        touched = feed_impacts(
+            states[0], states[1], states[2], states[3], positions, reads, trust,
+            np.array([author_column[p.author_id] for p in posts]),
+            np.array([p.emotional_intensity for p in posts]),
+            np.array([p.provocativeness for p in posts]),
+            np.array([p.consensus_orientation for p in posts]),
+            np.array([p.apparent_position for p in posts]),
+            self.PROVOCATION_THRESHOLD, self.EXTREME_PROVOCATION,
+            self.CONTAGION_RATE
+        )
+
+        for reader, state, trust_row, touched_row in zip(
+            readers, states.T.tolist(), trust.tolist(), touched.tolist()
+        ):
+            emotional_state = reader.emotional_state
+            (emotional_state.arousal, emotional_state.anger,
+             emotional_state.valence, emotional_state.engagement) = state
+
+            # Write back only the entries the feed changed
+            for author_id, value, changed in zip(authors, trust_row, touched_row):
+                if changed:
+                    reader.trust_scores[author_id] = value
+
+    def decay_all(self, agents: List[Agent], rate: float = 0.1) -> None:
+        """
+        Decay every agent's emotions toward baseline at once.
+
+        Same arithmetic as EmotionalState.decay for each agent, evaluated
+        with NumPy over the population's state columns.
+
+        Args:
+            agents: Agents whose emotional state decays
+            rate: Decay rate for this round
+        """
+        if not agents:
+            return
+
+        states = [a.emotional_state for a in agents]
+        arousal, anger, engagement, valence = np.array([
+            (s.arousal, s.anger, s.engagement, s.valence) for s in states
+        ]).T
+
+        # Arousal toward 0.4, anger fast, engagement slowly, valence to neutral
+        arousal = arousal - (arousal - 0.4) * rate
+        anger = np.maximum(anger - rate * 1.5, 0.0)
+        engagement = np.maximum(engagement - rate * 0.5, 0.3)
+        valence = valence * (1 - rate * 0.5)
+
+        for state, a, g, e, v in zip(states, arousal.tolist(), anger.tolist(),
+                                     engagement.tolist(), valence.tolist()):
+            state.arousal, state.anger, state.engagement, state.valence = a, g, e, v
+            state.arousal_history.append(a)
 
     def process_post_for_reader(
         self,
         post: Post,
         reader: Agent
-    ) -> Tuple[EmotionalImpact, float]:
+    ) -> Tuple[ImpactDeltas, float]:
         """
         Full processing of a post's effect on a reader.
 
         Returns:
-            Tuple of (EmotionalImpact, opinion_influence)
+            Tuple of (impact deltas, opinion_influence)
         """
-        # Calculate opinion alignment
-        # Infer post's opinion direction from its characteristics
-        if post.provocativeness > 0.5:
-            # Provocative posts are typically contrarian
-            post_opinion = -0.7
-        elif post.consensus_orientation > 0.6:
-            # Consensus-oriented posts support mainstream
-            post_opinion = 0.6
-        else:
-            # Neutral/mixed posts
-            post_opinion = 0.0
+        # Calculate opinion alignment against the post's apparent direction
+        # (contrarian if provocative, mainstream if consensus-oriented)
+        post_opinion = post.apparent_position
 
         opinion_alignment = 1 - abs(post_opinion - reader.opinion.position) / 2
 
@@ -171,9 +234,12 @@ def calculate_response_probability(agent: Agent, base_rate: float = 0.2) -> floa
 
 def describe_emotional_climate(agents: list) -> str:
     """Generate a natural language description of population emotional state."""
-    avg_arousal = sum(a.emotional_state.arousal for a in agents) / len(agents)
-    avg_anger = sum(a.emotional_state.anger for a in agents) / len(agents)
-    avg_engagement = sum(a.emotional_state.engagement for a in agents) / len(agents)
+    # One pass over the population, then column means
+    states = np.array([
+        (a.emotional_state.arousal, a.emotional_state.anger, a.emotional_state.engagement)
+        for a in agents
+    ])
+    avg_arousal, avg_anger, avg_engagement = states.mean(axis=0).tolist()
 
     if avg_arousal > 0.7:
         arousal_desc = "The debate has become heated and intense."
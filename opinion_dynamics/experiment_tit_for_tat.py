@@ -10,10 +10,15 @@ Key differences from baseline:
 3. Results saved to separate folder: results/tit_for_tat_norwegian/
 """
 
+import asyncio
+import functools
 import os
-import random
+import time
 from datetime import datetime
-from typing import List, Optional, Tuple
+from collections import Counter, deque
+from typing import Deque, List, Optional, Set, Tuple
+
+import numpy as np
 
 # Load .env file if present
 try:
@@ -25,13 +30,15 @@ except ImportError:
 import anthropic
 
 from models import (
-    Agent, AgentRole, Opinion, EmotionalState, Post,
-    SimulationConfig, ConversionEvent, BehaviorMetrics
+    Agent, AgentRole, Opinion, OpinionType, EmotionalState, Post,
+    SimulationConfig, ConversionEvent, BehaviorMetrics, initialize_trust_scores
 )
 from agents import ContentAnalyzer
 from emotions import EmotionalEngine, calculate_response_probability
-from amplification import AmplificationAlgorithm, compute_opinion_influence
-from tracking import SimulationTracker, detect_conversion, RoundSummary
+from amplification import (
+    AmplificationAlgorithm, PostBatch, compute_opinion_influence, analyze_amplification_bias
+)
+from tracking import SimulationTracker, detect_conversion, RoundSummary, write_json
 from visualization import save_all_visualizations
 
 from prompts_norwegian_tft import (
@@ -64,6 +71,7 @@ class TitForTatConfig:
     # Simulation parameters
     num_rounds: int = 50
     posts_per_round: int = 6
+    seed: Optional[int] = None  # seeds all of the simulation's random draws
 
     # Amplification weights
     emotion_weight: float = 0.4
@@ -107,32 +115,33 @@ class TitForTatLLMAgent:
     confrontational tone.
     """
 
-    def __init__(self, api_key: str, model: str = "claude-sonnet-4-20250514"):
-        self.client = anthropic.Anthropic(api_key=api_key)
+    USER_MESSAGE = "Skriv ditt innlegg nå."
+
+    # Retry schedule for rate limits, dropped connections and server errors
+    MAX_ATTEMPTS = 3
+    RETRY_BASE_DELAY = 10.0  # seconds, doubled on each retry
+
+    def __init__(self, api_key: str, model: str = "claude-sonnet-4-20250514", concurrency: int = 8):
+        self.client = _get_client(api_key)
+        self.api_key = api_key
         self.model = model
+        self.concurrency = concurrency  # Max simultaneous API calls in generate_posts_batch
         self.analyzer = ContentAnalyzer()
 
-    def generate_post(
+        # Event loop, async client and semaphore for generate_posts_batch.
+        # Kept across rounds so the client's connection pool is reused;
+        # created on first use and released by close()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._async_client: Optional[anthropic.AsyncAnthropic] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+
+    def _build_system_prompt(
         self,
         agent: Agent,
-        topic: str,
-        max_tokens: int = 80,  # ~280 characters, tweet-length
-        reply_to_post: Optional[Post] = None,
-        is_tit_for_tat: bool = False
-    ) -> Post:
-        """
-        Generate a post, optionally as a tit-for-tat reply.
-
-        Args:
-            agent: The agent generating the post
-            topic: Debate topic (not used directly, topic is in prompts)
-            max_tokens: Max tokens for response
-            reply_to_post: If set, this is a reply to that post
-            is_tit_for_tat: If True, use confrontational reply prompt
-
-        Returns:
-            Post object with content and metrics
-        """
+        reply_to_post: Optional[Post],
+        is_tit_for_tat: bool
+    ) -> str:
+        """Pick the role (or tit-for-tat reply) template and fill it with the agent's state."""
         # Determine which prompt to use
         is_reply_to_contrarian = (
             is_tit_for_tat and
@@ -153,7 +162,7 @@ class TitForTatLLMAgent:
         # For tit-for-tat replies, include the contrarian post content
         reply_content = reply_to_post.content if reply_to_post else ""
 
-        system_prompt = format_prompt_no(
+        return format_prompt_no(
             template,
             emotion_description=emotion_desc,
             memory=agent.memory,
@@ -161,23 +170,17 @@ class TitForTatLLMAgent:
             reply_to_content=reply_content
         )
 
-        # Call Claude API
-        try:
-            response = self.client.messages.create(
-                model=self.model,
-                max_tokens=max_tokens,
-                system=system_prompt,
-                messages=[{"role": "user", "content": "Skriv ditt innlegg nå."}]
-            )
-            content = response.content[0].text.strip()
-            content = content.strip('"\'')
-
-        except Exception as e:
-            content = f"[API Error: {str(e)[:50]}]"
-            print(f"Warning: API call failed for agent {agent.id}: {e}")
-
+    def _make_post(
+        self,
+        agent: Agent,
+        content: str,
+        reply_to_post: Optional[Post],
+        metrics: Optional[dict] = None
+    ) -> Post:
+        """Analyze content, build the Post and record the author's metrics."""
         # Analyze content
-        metrics = self.analyzer.analyze(content)
+        if metrics is None:
+            metrics = self.analyzer.analyze(content)
 
         # Create post
         post = Post(
@@ -202,6 +205,166 @@ class TitForTatLLMAgent:
 
         return post
 
+    def generate_post(
+        self,
+        agent: Agent,
+        topic: str,
+        max_tokens: int = 80,  # ~280 characters, tweet-length
+        reply_to_post: Optional[Post] = None,
+        is_tit_for_tat: bool = False
+    ) -> Post:
+        """
+        Generate a post, optionally as a tit-for-tat reply.
+
+        Args:
+            agent: The agent generating the post
+            topic: Debate topic (not used directly, topic is in prompts)
+            max_tokens: Max tokens for response
+            reply_to_post: If set, this is a reply to that post
+            is_tit_for_tat: If True, use confrontational reply prompt
+
+        Returns:
+            Post object with content and metrics
+        """
+        system_prompt = self._build_system_prompt(agent, reply_to_post, is_tit_for_tat)
+
+        # Call Claude API
+        try:
+            for attempt in range(self.MAX_ATTEMPTS):
+                try:
+                    response = self.client.messages.create(
+                        model=self.model,
+                        max_tokens=max_tokens,
+                        system=system_prompt,
+                        messages=[{"role": "user", "content": self.USER_MESSAGE}]
+                    )
+                    break
+                except (anthropic.RateLimitError, anthropic.APIConnectionError,
+                        anthropic.InternalServerError):
+                    if attempt == self.MAX_ATTEMPTS - 1:
+                        raise
+                    time.sleep(self.RETRY_BASE_DELAY * 2 ** attempt)
+            content = response.content[0].text.strip()
+            content = content.strip('"\'')
+
+        except Exception as e:
+            content = f"[API Error: {str(e)[:50]}]"
+            print(f"Warning: API call failed for agent {agent.id}: {e}")
+
+        return self._make_post(agent, content, reply_to_post)
+
+    async def _agenerate_content(
+        self,
+        client: anthropic.AsyncAnthropic,
+        semaphore: asyncio.Semaphore,
+        agent: Agent,
+        max_tokens: int,
+        reply_to_post: Optional[Post],
+        is_tit_for_tat: bool
+    ) -> str:
+        """Async counterpart of generate_post's API call, retrying on rate limits."""
+        system_prompt = self._build_system_prompt(agent, reply_to_post, is_tit_for_tat)
+
+        try:
+            for attempt in range(self.MAX_ATTEMPTS):
+                try:
+                    async with semaphore:
+                        response = await client.messages.create(
+                            model=self.model,
+                            max_tokens=max_tokens,
+                            system=system_prompt,
+                            messages=[{"role": "user", "content": self.USER_MESSAGE}]
+                        )
+                    break
+                except (anthropic.RateLimitError, anthropic.APIConnectionError,
+                        anthropic.InternalServerError):
+                    if attempt == self.MAX_ATTEMPTS - 1:
+                        raise
+                    # Back off outside the semaphore so other agents can proceed
+                    await asyncio.sleep(self.RETRY_BASE_DELAY * 2 ** attempt)
+            content = response.content[0].text.strip()
+            content = content.strip('"\'')
+
+        except Exception as e:
+            content = f"[API Error: {str(e)[:50]}]"
+            print(f"Warning: API call failed for agent {agent.id}: {e}")
+
+        return content
+
+    async def _agenerate_contents(
+        self,
+        speaker_configs: List[Tuple[Agent, Optional[Post], bool]],
+        max_tokens: int
+    ) -> List[str]:
+        """Fan out one request per speaker, at most `concurrency` in flight."""
+        # Client and semaphore are bound to the event loop, so they are
+        # created inside it (the loop itself lives until close())
+        if self._async_client is None:
+            self._async_client = anthropic.AsyncAnthropic(api_key=self.api_key)
+            self._semaphore = asyncio.Semaphore(self.concurrency)
+        return await asyncio.gather(*[
+            self._agenerate_content(
+                self._async_client, self._semaphore, agent, max_tokens, reply_to, is_tft
+            )
+            for agent, reply_to, is_tft in speaker_configs
+        ])
+
+    def generate_posts_batch(
+        self,
+        speaker_configs: List[Tuple[Agent, Optional[Post], bool]],
+        topic: str,
+        max_tokens: int = 80
+    ) -> List[Post]:
+        """
+        Generate one post per speaker with concurrent API calls.
+
+        Equivalent to calling generate_post for each speaker in turn (agent
+        states are only read while posts are generated), but round latency
+        is set by the slowest call rather than the sum.
+
+        Args:
+            speaker_configs: (agent, reply_to_post, is_tit_for_tat) tuples
+            topic: Debate topic (not used directly, topic is in prompts)
+            max_tokens: Max tokens per response
+
+        Returns:
+            Posts in the same order as speaker_configs
+        """
+        if not speaker_configs:
+            return []
+        if self._loop is None:
+            self._loop = asyncio.new_event_loop()
+        contents = self._loop.run_until_complete(
+            self._agenerate_contents(speaker_configs, max_tokens)
+        )
+        metrics = self.analyzer.analyze_batch(contents)
+        return [
+            self._make_post(agent, content, reply_to, m)
+            for (agent, reply_to, _), content, m in zip(speaker_configs, contents, metrics)
+        ]
+
+    def close(self) -> None:
+        """Close the async client and its event loop (recreated on next use)."""
+        if self._loop is None:
+            return
+        if self._async_client is not None:
+            self._loop.run_until_complete(self._async_client.close())
+        self._loop.close()
+        self._loop = None
+        self._async_client = None
+        self._semaphore = None
+
+
+@functools.lru_cache(maxsize=None)
+def _get_client(api_key: str) -> anthropic.Anthropic:
+    """
+    Shared sync client per API key.
+
+    The SDK client keeps a keep-alive connection pool, so reusing one
+    instance across agents and runs avoids repeating TCP/TLS handshakes.
+    """
+    return anthropic.Anthropic(api_key=api_key)
+
 
 # =============================================================================
 # MODIFIED SIMULATION ENGINE
@@ -219,20 +382,33 @@ class TitForTatSimulation:
     def __init__(self, config: TitForTatConfig, api_key: str):
         self.config = config
         self.llm = TitForTatLLMAgent(api_key, config.model)
-        self.amplifier = AmplificationAlgorithm(config)
+        # One generator for initial positions, speaker, reply and backlash
+        # draws; the feed gets its own stream spawned from it
+        self.rng = np.random.default_rng(config.seed)
+
+        self.amplifier = AmplificationAlgorithm(config, rng=self.rng.spawn(1)[0])
         self.emotion_engine = EmotionalEngine()
         self.tracker = SimulationTracker()
 
         self.agents: List[Agent] = []
-        self.all_posts: List[Post] = []
+        # Per-role views of the population, filled by initialize_population
+        self._contrarians: List[Agent] = []
+        self._consensus: List[Agent] = []
+        self._neutrals: List[Agent] = []
+        self._neutral_ids: Set[str] = set()
+        self.all_posts = PostBatch()  # feed features kept as arrays for ranking
 
-        # Track contrarian posts for reply targeting
-        self.recent_contrarian_posts: List[Post] = []
+        # Track contrarian posts for reply targeting (only the last 5 are kept)
+        self.recent_contrarian_posts: Deque[Post] = deque(maxlen=5)
 
     def initialize_population(self) -> None:
         """Create the agent population with Norwegian names."""
         agent_id = 0
 
+        # Initial position scatter, drawn in one go per role
+        consensus_offsets = self.rng.uniform(-0.1, 0.1, self.config.num_consensus).tolist()
+        neutral_positions = self.rng.uniform(-0.2, 0.2, self.config.num_neutrals).tolist()
+
         # Contrarian (1)
         for i in range(self.config.num_contrarians):
             self.agents.append(Agent(
@@ -256,7 +432,7 @@ class TitForTatSimulation:
                 role=AgentRole.CONSENSUS_ADVOCATE,
                 name=name,
                 opinion=Opinion(
-                    position=0.7 + random.uniform(-0.1, 0.1),
+                    position=0.7 + consensus_offsets[i],
                     confidence=0.7,
                     stability=0.6
                 ),
@@ -281,7 +457,7 @@ class TitForTatSimulation:
                 role=AgentRole.NEUTRAL_OBSERVER,
                 name=name,
                 opinion=Opinion(
-                    position=random.uniform(-0.2, 0.2),
+                    position=neutral_positions[i],
                     confidence=0.3,
                     stability=0.2
                 ),
@@ -292,19 +468,14 @@ class TitForTatSimulation:
             ))
             agent_id += 1
 
+        # The population is fixed from here on, so split it by role once
+        self._contrarians = [a for a in self.agents if a.role == AgentRole.CONTRARIAN_PROVOCATEUR]
+        self._consensus = [a for a in self.agents if a.role == AgentRole.CONSENSUS_ADVOCATE]
+        self._neutrals = [a for a in self.agents if a.role == AgentRole.NEUTRAL_OBSERVER]
+        self._neutral_ids = {a.id for a in self._neutrals}
+
         # Initialize trust scores
-        for agent in self.agents:
-            for other in self.agents:
-                if other.id != agent.id:
-                    base_trust = 0.5
-                    if agent.role == other.role:
-                        base_trust = 0.6
-                    if (agent.role == AgentRole.CONSENSUS_ADVOCATE and
-                        other.role == AgentRole.CONTRARIAN_PROVOCATEUR):
-                        base_trust = 0.35
-                    if agent.role == AgentRole.NEUTRAL_OBSERVER:
-                        base_trust = 0.5
-                    agent.trust_scores[other.id] = base_trust
+        initialize_trust_scores(self.agents)
 
         # Record initial positions
         for agent in self.agents:
@@ -328,40 +499,36 @@ class TitForTatSimulation:
         Returns:
             List of (agent, reply_to_post, is_tit_for_tat) tuples
         """
-        # Calculate posting probabilities
-        probabilities = []
-        for agent in self.agents:
-            prob = calculate_response_probability(agent, base_rate=0.2)
-            probabilities.append(prob)
-
-        total = sum(probabilities)
-        weights = [p / total for p in probabilities]
-
-        # Select speakers
-        speakers = random.choices(self.agents, weights=weights, k=self.config.posts_per_round)
+        # Calculate posting probabilities (once per round; they follow emotional state)
+        probabilities = np.array([
+            calculate_response_probability(agent, base_rate=0.2) for agent in self.agents
+        ])
+
+        # Select speakers (with replacement, in proportion to probability)
+        speaker_indices = self.rng.choice(
+            len(self.agents), size=self.config.posts_per_round,
+            p=probabilities / probabilities.sum()
+        )
+        speakers = [self.agents[i] for i in speaker_indices.tolist()]
 
         # Ensure contrarian speaks regularly
-        contrarians = [a for a in self.agents if a.role == AgentRole.CONTRARIAN_PROVOCATEUR]
+        contrarians = self._contrarians
         if contrarians and round_num % 3 == 0:
             if contrarians[0] not in speakers:
                 speakers[0] = contrarians[0]
 
-        # Remove duplicates
-        seen = set()
-        unique_speakers = []
-        for speaker in speakers:
-            if speaker.id not in seen:
-                seen.add(speaker.id)
-                unique_speakers.append(speaker)
+        # Remove duplicates while maintaining order (dicts keep first insertion)
+        unique_speakers = list({speaker.id: speaker for speaker in speakers}.values())
 
         # Determine reply context for each speaker
         result = []
         recent_contrarian = self.get_recent_contrarian_post()
+        reply_draws = self.rng.random(len(unique_speakers)) < self.config.reply_to_contrarian_probability
 
-        for speaker in unique_speakers:
+        for speaker, reply_draw in zip(unique_speakers, reply_draws.tolist()):
             if (speaker.role == AgentRole.CONSENSUS_ADVOCATE and
                 recent_contrarian is not None and
-                random.random() < self.config.reply_to_contrarian_probability):
+                reply_draw):
                 # Tit-for-tat reply
                 result.append((speaker, recent_contrarian, True))
             else:
@@ -373,33 +540,30 @@ class TitForTatSimulation:
     def run_round(self, round_num: int) -> RoundSummary:
         """Execute a single round with tit-for-tat mechanics."""
 
+        # Round log lines, printed together once the round's reading is done
+        log_lines: List[str] = []
+
         # Select speakers with reply context
         speaker_configs = self.select_speakers(round_num)
 
-        # Generate posts
-        round_posts = []
-        for agent, reply_to, is_tft in speaker_configs:
-            post = self.llm.generate_post(
-                agent,
-                self.config.debate_topic,
-                self.config.max_tokens_per_response,
-                reply_to_post=reply_to,
-                is_tit_for_tat=is_tft
-            )
+        # Generate posts (API calls run concurrently); the batch comes back
+        # as a list in speaker order, which is used as the round's posts
+        round_posts = self.llm.generate_posts_batch(
+            speaker_configs,
+            self.config.debate_topic,
+            self.config.max_tokens_per_response
+        )
+        for (agent, reply_to, is_tft), post in zip(speaker_configs, round_posts):
             post.round_num = round_num
-            round_posts.append(post)
             agent.posts_made.append(post.id)
 
             # Track contrarian posts for future replies
             if agent.role == AgentRole.CONTRARIAN_PROVOCATEUR:
-                self.recent_contrarian_posts.append(post)
-                # Keep only last 5 for reply targeting
-                if len(self.recent_contrarian_posts) > 5:
-                    self.recent_contrarian_posts.pop(0)
+                self.recent_contrarian_posts.append(post)  # oldest drops off past 5
 
             # Log tit-for-tat replies
             if is_tft:
-                print(f"  [TIT-FOR-TAT] {agent.name} replies to contrarian")
+                log_lines.append(f"  [TIT-FOR-TAT] {agent.name} replies to contrarian")
 
         self.all_posts.extend(round_posts)
 
@@ -412,37 +576,56 @@ class TitForTatSimulation:
         round_conversions: List[ConversionEvent] = []
         last_influential_post: Optional[Post] = None
 
-        for agent in self.agents:
-            for post in visible_posts:
-                if post.author_id == agent.id:
-                    continue
+        # Feed minus own posts, per author in the feed (others read it all)
+        feed_without = {
+            author_id: [p for p in visible_posts if p.author_id != author_id]
+            for author_id in {p.author_id for p in visible_posts}
+        }
+
+        # Agents with fixed positions (all but neutrals) take the feed's
+        # emotional impact in one batched call, parallel across agents
+        self.emotion_engine.apply_feed(self._contrarians + self._consensus, visible_posts)
 
+        for agent in self.agents:
+            is_neutral = agent.id in self._neutral_ids
+            for post in feed_without.get(agent.id, visible_posts):
                 agent.remember_post(post, self.config.memory_window)
 
-                impact, _ = self.emotion_engine.process_post_for_reader(post, agent)
-                self.emotion_engine.apply_impact(agent, impact, post.author_id)
+                if is_neutral:
+                    # Neutrals' positions move as they read, so their
+                    # emotional impact is computed post by post
+                    impact, _ = self.emotion_engine.process_post_for_reader(post, agent)
+                    self.emotion_engine.apply_impact(agent, impact, post.author_id)
 
-                if agent.role == AgentRole.NEUTRAL_OBSERVER:
+                    trust = agent.get_trust(post.author_id)
                     influence_dir, influence_str, is_contrarian = compute_opinion_influence(
-                        post, agent.opinion.position, agent.get_trust(post.author_id)
+                        post, agent.opinion.position, trust
                     )
+                    old_position = agent.opinion.position
                     delta = agent.opinion.update(
                         influence=influence_dir * influence_str,
-                        source_trust=agent.get_trust(post.author_id),
+                        source_trust=trust,
                         emotional_impact=post.emotional_intensity,
-                        is_contrarian_source=is_contrarian
+                        is_contrarian_source=is_contrarian,
+                        rng=self.rng
                     )
                     if abs(delta) > 0.05:
                         last_influential_post = post
 
-                    conversion = detect_conversion(agent, round_num, last_influential_post)
-                    if conversion:
-                        round_conversions.append(conversion)
-                        print(f"  KONVERTERING: {agent.name} -> {conversion.direction}")
+                    # A conversion needs this step to cross a threshold
+                    # (same test detect_conversion applies), so skip the call otherwise
+                    new_position = agent.opinion.position
+                    if new_position < -0.3 <= old_position or old_position <= 0.3 < new_position:
+                        conversion = detect_conversion(agent, round_num, last_influential_post)
+                        if conversion:
+                            round_conversions.append(conversion)
+                            log_lines.append(f"  KONVERTERING: {agent.name} -> {conversion.direction}")
+
+        if log_lines:
+            print("\n".join(log_lines))
 
         # Decay emotions
-        for agent in self.agents:
-            agent.emotional_state.decay(self.config.emotional_decay_rate)
+        self.emotion_engine.decay_all(self.agents, self.config.emotional_decay_rate)
 
         # Record round
         summary = self.tracker.record_round(
@@ -478,14 +661,17 @@ class TitForTatSimulation:
             print(f"Startfordeling: {initial_dist}")
             print("-" * 50)
 
-        # Run rounds
-        for round_num in range(1, self.config.num_rounds + 1):
-            summary = self.run_round(round_num)
+        # Run rounds (one event loop and async client serve every round)
+        try:
+            for round_num in range(1, self.config.num_rounds + 1):
+                summary = self.run_round(round_num)
 
-            if verbose and round_num % 10 == 0:
-                print(f"Runde {round_num}: {summary.opinion_distribution}")
-                print(f"  Gj.snitt mening: {summary.average_opinion:+.3f}, "
-                      f"Gj.snitt arousal: {summary.average_arousal:.3f}")
+                if verbose and round_num % 10 == 0:
+                    print(f"Runde {round_num}: {summary.opinion_distribution}")
+                    print(f"  Gj.snitt mening: {summary.average_opinion:+.3f}, "
+                          f"Gj.snitt arousal: {summary.average_arousal:.3f}")
+        finally:
+            self.llm.close()
 
         # Final summary
         if verbose:
@@ -494,30 +680,29 @@ class TitForTatSimulation:
             print(f"Sluttfordeling: {final_dist}")
             print(f"Totale konverteringer: {len(self.tracker.conversion_events)}")
 
-            to_contrarian = sum(
-                1 for e in self.tracker.conversion_events
-                if e.direction == "to_contrarian"
-            )
-            to_consensus = sum(
-                1 for e in self.tracker.conversion_events
-                if e.direction == "to_consensus"
-            )
-            print(f"  Til kontrær: {to_contrarian}")
-            print(f"  Til konsensus: {to_consensus}")
+            directions = self._count_conversions()
+            print(f"  Til kontrær: {directions['to_contrarian']}")
+            print(f"  Til konsensus: {directions['to_consensus']}")
 
         return self.tracker
 
+    def _count_conversions(self) -> Counter:
+        """Count conversion events by direction (missing directions count 0)."""
+        return Counter(e.direction for e in self.tracker.conversion_events)
+
     def _count_opinions(self) -> dict:
         """Count agents by opinion type."""
-        from models import OpinionType
-        counts = {t.value: 0 for t in OpinionType}
-        for agent in self.agents:
-            counts[agent.opinion.classify().value] += 1
-        return counts
+        positions = np.fromiter(
+            (agent.opinion.position for agent in self.agents), dtype=np.float64, count=len(self.agents)
+        )
+        # Same thresholds as Opinion.classify, coded in OpinionType order
+        # (contrarian, consensus, neutral)
+        codes = np.where(positions < -0.3, 0, np.where(positions > 0.3, 1, 2))
+        counts = np.bincount(codes, minlength=len(OpinionType)).tolist()
+        return {t.value: count for t, count in zip(OpinionType, counts)}
 
     def get_amplification_analysis(self) -> dict:
         """Analyze algorithmic amplification bias."""
-        from amplification import analyze_amplification_bias
         return analyze_amplification_bias(self.all_posts)
 
     def save_results(self, timestamp: str) -> dict:
@@ -527,14 +712,13 @@ class TitForTatSimulation:
         with open(transcript_path, 'w', encoding='utf-8') as f:
             f.write(f"TIT-FOR-TAT EXPERIMENT: {timestamp}\n")
             f.write(f"{'='*60}\n\n")
-            for post in self.all_posts:
-                f.write(post.to_transcript_line())
-                f.write("\n")
+            # One write for the whole transcript rather than two per post
+            f.write("".join(f"{post.to_transcript_line()}\n" for post in self.all_posts))
 
         # Save simulation data
-        import json
         data_path = os.path.join(RESULTS_DIR, f"simulation_data_{timestamp}.json")
 
+        directions = self._count_conversions()
         data = {
             "experiment": EXPERIMENT_NAME,
             "config": {
@@ -547,8 +731,8 @@ class TitForTatSimulation:
             "results": {
                 "total_posts": len(self.all_posts),
                 "total_conversions": len(self.tracker.conversion_events),
-                "to_contrarian": sum(1 for e in self.tracker.conversion_events if e.direction == "to_contrarian"),
-                "to_consensus": sum(1 for e in self.tracker.conversion_events if e.direction == "to_consensus"),
+                "to_contrarian": directions["to_contrarian"],
+                "to_consensus": directions["to_consensus"],
                 "final_distribution": self._count_opinions(),
             },
             "amplification_analysis": self.get_amplification_analysis(),
@@ -563,8 +747,9 @@ class TitForTatSimulation:
             ]
         }
 
-        with open(data_path, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
+        # Non-finite values (bias_ratio is inf when no post reads as
+        # consensus) are written the same with or without orjson
+        write_json(data, data_path)
 
         # Generate visualizations
         viz_paths = save_all_visualizations(
@@ -0,0 +1,350 @@
+"""
+Compiled numeric kernels for the Opinion Dynamics Simulation.
+
+Hot arithmetic is written as plain Python on scalars and arrays so Numba
+can compile it. Without numba installed the decorators are no-ops and the
+same functions run as ordinary Python, giving identical results (no
+fastmath, so float operations happen in source order either way).
+"""
+
+import math
+
+import numpy as np
+
+# Optional: JIT compilation (pip install numba)
+try:
+    from numba import njit, prange
+    HAVE_NUMBA = True
+except ImportError:
+    HAVE_NUMBA = False
+    prange = range
+
+    def njit(*args, **kwargs):
+        """Stand-in for numba.njit that returns the function unchanged."""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda func: func
+
+
+@njit(cache=True)
+def score_post(
+    exclamations, questions, length, caps, letters, high_hits, medium_hits,
+    confrontational_hits, you_count, scare_quotes, challenge, imperative,
+    connector_hits, sentence_count, avg_sentence_len, evidence,
+    consensus_hits, hedge_hits, acknowledgement, absolute_hits
+):
+    """
+    Combine a post's lexical counts into its four content metrics.
+
+    Returns:
+        (emotional_intensity, provocativeness, logical_coherence,
+         consensus_orientation)
+    """
+    # --- Emotional intensity ---
+    emotional = 0.0
+    # Exclamation marks (strong signal)
+    emotional += min(exclamations * 0.15, 0.45)
+    # Question marks (rhetorical questions)
+    emotional += min(questions * 0.08, 0.24)
+    # Caps ratio (SHOUTING)
+    if length > 10 and letters > 0 and caps / letters > 0.3:
+        emotional += 0.2
+    # High- and medium-intensity words
+    emotional += 0.12 * high_hits
+    emotional += 0.06 * medium_hits
+    emotional = min(1.0, emotional)
+
+    # --- Provocativeness ---
+    provocative = 0.0
+    # Direct confrontational patterns
+    provocative += 0.15 * confrontational_hits
+    # "You" statements (direct address, often confrontational)
+    provocative += min(you_count * 0.08, 0.24)
+    # Scare quotes (dismissive)
+    provocative += min(scare_quotes * 0.1, 0.2)
+    # Rhetorical questions with challenge words
+    if challenge:
+        provocative += 0.15
+    # Imperative mood starters
+    if imperative:
+        provocative += 0.1
+    provocative = min(1.0, provocative)
+
+    # --- Logical coherence ---
+    logical = 0.4  # Base score
+    # Logical connectors
+    logical += 0.1 * connector_hits
+    # Sentence structure (longer, more structured = higher)
+    if sentence_count >= 2:
+        logical += 0.1
+    # Average sentence length (not too short)
+    if avg_sentence_len > 8:
+        logical += 0.1
+    # Evidence references
+    if evidence:
+        logical += 0.15
+    logical = min(1.0, logical)
+
+    # --- Consensus orientation ---
+    consensus = 0.3  # Base score
+    # Consensus markers
+    consensus += 0.12 * consensus_hits
+    # Hedging language (nuanced, not absolute)
+    consensus += 0.05 * hedge_hits
+    # Acknowledging other side
+    if acknowledgement:
+        consensus += 0.15
+    # Negative for absolute language
+    consensus -= 0.08 * absolute_hits
+    consensus = max(0.0, min(1.0, consensus))
+
+    return emotional, provocative, logical, consensus
+
+
+@njit(cache=True, parallel=True)
+def score_posts(
+    exclamations, questions, length, caps, letters, high_hits, medium_hits,
+    confrontational_hits, you_count, scare_quotes, challenge, imperative,
+    connector_hits, sentence_count, avg_sentence_len, evidence,
+    consensus_hits, hedge_hits, acknowledgement, absolute_hits
+):
+    """
+    score_post over arrays of per-post counts.
+
+    Returns:
+        float64 array of shape (n, 4), columns as in score_post
+    """
+    n = exclamations.shape[0]
+    out = np.empty((n, 4))
+    for i in prange(n):
+        e, p, l, c = score_post(
+            exclamations[i], questions[i], length[i], caps[i], letters[i],
+            high_hits[i], medium_hits[i], confrontational_hits[i], you_count[i],
+            scare_quotes[i], challenge[i], imperative[i], connector_hits[i],
+            sentence_count[i], avg_sentence_len[i], evidence[i],
+            consensus_hits[i], hedge_hits[i], acknowledgement[i], absolute_hits[i]
+        )
+        out[i, 0] = e
+        out[i, 1] = p
+        out[i, 2] = l
+        out[i, 3] = c
+    return out
+
+
+@njit(cache=True)
+def visibility(
+    emotional_intensity, provocativeness, rounds_old, engagement, noise,
+    emotion_weight, provocative_weight, recency_weight
+):
+    """
+    Feed visibility of one post (see AmplificationAlgorithm.compute_visibility).
+
+    Returns:
+        Visibility score
+    """
+    # Recency decay: newer posts score higher
+    recency_score = 1.0 / (1.0 + rounds_old * 0.25)
+
+    # Base visibility from content features
+    base_visibility = (
+        emotion_weight * emotional_intensity +
+        provocative_weight * provocativeness +
+        recency_weight * recency_score
+    )
+
+    # Engagement boost: highly engaging content gets exponential amplification
+    # (squared by multiplication, as NumPy does in compute_visibilities)
+    engagement_boost = 1.0 + (engagement * engagement) * 0.6
+
+    return base_visibility * engagement_boost * noise
+
+
+@njit(cache=True)
+def emotional_impact(
+    emotional_intensity, provocativeness, consensus_orientation,
+    opinion_alignment, provocation_threshold, extreme_provocation,
+    contagion_rate
+):
+    """
+    Emotional deltas for a reader (see EmotionalEngine.calculate_emotional_impact).
+
+    Returns:
+        (arousal_delta, anger_delta, valence_delta, engagement_delta,
+         trust_delta)
+    """
+    anger_delta = 0.0
+    valence_delta = 0.0
+    engagement_delta = 0.0
+    trust_delta = 0.0
+
+    # Base emotional contagion from post intensity
+    arousal_delta = emotional_intensity * contagion_rate
+
+    # Provocation effects
+    if provocativeness > provocation_threshold:
+        # Disagreement with provocative content causes anger
+        if opinion_alignment < 0:  # They disagree with post
+            anger_delta = provocativeness * abs(opinion_alignment) * 0.5
+            valence_delta = -provocativeness * 0.3
+
+            # Extreme provocation may reduce trust in author
+            if provocativeness > extreme_provocation:
+                trust_delta = -0.15
+        else:
+            # Agreement with provocative content validates and energizes
+            engagement_delta = provocativeness * 0.3
+            valence_delta = provocativeness * 0.1
+
+    # Agreeable/consensus-oriented content
+    if consensus_orientation > 0.6:
+        if opinion_alignment > 0:  # They agree with post
+            arousal_delta -= 0.1  # Calming effect
+            valence_delta += 0.15
+            trust_delta += 0.05
+        else:
+            # Disagreement with reasonable content is less inflammatory
+            arousal_delta += 0.05
+
+    # Engagement always increases when reading (they're paying attention)
+    engagement_delta += 0.1 * emotional_intensity
+
+    return arousal_delta, anger_delta, valence_delta, engagement_delta, trust_delta
+
+
+@njit(cache=True, parallel=True)
+def feed_impacts(
+    arousal, anger, valence, engagement, positions, reads, trust,
+    post_author, emotional_intensity, provocativeness, consensus_orientation,
+    apparent_position, provocation_threshold, extreme_provocation,
+    contagion_rate
+):
+    """
+    Apply a feed's emotional impact to many readers, one reader per thread.
+
+    Each reader takes the posts in order, with emotional_impact deltas and
+    the same clamping as EmotionalEngine.apply_impact and
+    Agent.update_trust. Readers' positions must not change while reading.
+    The four state arrays (one entry per reader) and the trust matrix
+    (reader by author, post_author[j] being post j's author column) are
+    updated in place; reads[i, j] says whether reader i sees post j.
+
+    Returns:
+        (n_readers, n_authors) bool array marking the trust entries updated
+    """
+    n_readers, n_posts = reads.shape
+    touched = np.zeros(trust.shape, dtype=np.bool_)
+    for i in prange(n_readers):
+        a = arousal[i]
+        g = anger[i]
+        v = valence[i]
+        e = engagement[i]
+        for j in range(n_posts):
+            if not reads[i, j]:
+                continue
+            alignment = 1 - abs(apparent_position[j] - positions[i]) / 2
+            da, dg, dv, de, dt = emotional_impact(
+                emotional_intensity[j], provocativeness[j],
+                consensus_orientation[j], alignment, provocation_threshold,
+                extreme_provocation, contagion_rate
+            )
+            a = a + da
+            a = 0.0 if a < 0.0 else 1.0 if a > 1.0 else a
+            g = g + dg
+            g = 0.0 if g < 0.0 else 1.0 if g > 1.0 else g
+            v = v + dv
+            v = -1.0 if v < -1.0 else 1.0 if v > 1.0 else v
+            e = e + de
+            e = 0.0 if e < 0.0 else 1.0 if e > 1.0 else e
+            if dt != 0:
+                k = post_author[j]
+                t = trust[i, k] + dt
+                t = 1.0 if t > 1.0 else t
+                trust[i, k] = 0.1 if t < 0.1 else t
+                touched[i, k] = True
+        arousal[i] = a
+        anger[i] = g
+        valence[i] = v
+        engagement[i] = e
+    return touched
+
+
+@njit(cache=True)
+def opinion_update(
+    position, confidence, stability, cognitive_investment,
+    investment_direction, influence, source_trust, emotional_impact,
+    is_contrarian_source, logical_coherence, emotional_susceptibility,
+    analytical_weight, change_rate, reversal_resistance, debate_temperature,
+    agent_arousal, backlash_draw
+):
+    """
+    One opinion update step (see Opinion.update for the model).
+
+    backlash_draw is the uniform draw deciding a backlash; it is only
+    consulted for highly emotional contrarian content.
+
+    Returns:
+        (position, stability, cognitive_investment, investment_direction)
+        after the update
+    """
+    # === SYSTEM 1 / SYSTEM 2 PROCESSING MODE (calculate_processing_mode) ===
+    system2_capacity = max(
+        0.1, analytical_weight - debate_temperature * 0.4 - agent_arousal * 0.3
+    )
+    system1_weight = 1.0 - system2_capacity
+
+    # Base susceptibility: uncertain, unstable opinions change more
+    susceptibility = (1 - confidence * 0.4) * (1 - stability * 0.3)
+
+    # === DUAL-PROCESS CONTENT EFFECTIVENESS ===
+    emotional_effectiveness = emotional_impact * emotional_susceptibility
+    analytical_effectiveness = logical_coherence * analytical_weight
+    content_effectiveness = (
+        system1_weight * emotional_effectiveness +
+        system2_capacity * analytical_effectiveness
+    )
+
+    # System 1 processing increases susceptibility to any content
+    system1_susceptibility_boost = system1_weight * emotional_impact * 0.4
+    susceptibility *= (1 + system1_susceptibility_boost)
+
+    # Apply overall change rate from personality
+    susceptibility *= change_rate
+
+    # Backlash effect: extremely provocative content can backfire
+    if emotional_impact > 0.8 and is_contrarian_source:
+        backlash_probability = 0.3 * system2_capacity * (2.0 - emotional_susceptibility)
+        if backlash_draw < backlash_probability:
+            influence = -influence * 0.5
+
+    # === COGNITIVE INVESTMENT MECHANISM ===
+    influence_sign = -1 if influence < 0 else (1 if influence > 0 else 0)
+    investment_sign = -1 if investment_direction < 0 else (1 if investment_direction > 0 else 0)
+
+    if influence_sign != 0 and investment_sign != 0 and influence_sign != investment_sign:
+        # REVERSAL: Moving against accumulated cognitive investment
+        base_resistance = math.exp(-cognitive_investment * 2.0)
+        effective_influence = influence * base_resistance ** reversal_resistance
+
+        # Reversals slowly erode existing investment
+        erosion_rate = 0.02 / reversal_resistance
+        cognitive_investment = max(0.0, cognitive_investment - abs(influence) * erosion_rate)
+    else:
+        # REINFORCEMENT: Moving with the flow, or first movement
+        effective_influence = influence
+
+        # Build cognitive investment proportional to the shift
+        investment_gain = abs(influence) * source_trust * 0.8 * reversal_resistance
+        cognitive_investment = min(2.0, cognitive_investment + investment_gain)
+
+        # Update investment direction
+        if influence_sign != 0:
+            investment_direction = investment_direction * 0.8 + influence_sign * 0.2
+
+    # Calculate and apply delta (include content effectiveness)
+    delta = effective_influence * source_trust * susceptibility * content_effectiveness * 0.15
+    position = max(-1.0, min(1.0, position + delta))
+
+    # Stability increases slightly (opinions solidify)
+    stability = min(0.9, stability + 0.01)
+
+    return position, stability, cognitive_investment, investment_direction
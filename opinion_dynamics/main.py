@@ -8,11 +8,16 @@ Usage:
     python main.py --api-key sk-xxx         # Explicit API key
     python main.py --interactive            # Interactive mode to configure options
     python main.py --language no            # Norwegian language
+    python main.py --batch                  # Message Batches API (cheaper, slower)
+    python main.py --cache                  # Replay cached responses across runs
 """
 
 import os
 import argparse
+from collections import Counter
+from dataclasses import dataclass
 from datetime import datetime
+from typing import Optional
 
 from models import SimulationConfig
 from simulation import SimulationEngine
@@ -20,12 +25,89 @@ from visualization import save_all_visualizations
 from amplification import analyze_amplification_bias
 
 
+@dataclass(frozen=True, slots=True)
+class ResultStats:
+    """Headline results of a finished simulation."""
+    initial: dict           # Opinion distribution after the first round
+    final: dict             # Opinion distribution after the last round
+    shift: float            # Change in average opinion (negative = toward contrarian)
+    to_contrarian: int      # Conversions to contrarian
+    to_consensus: int       # Conversions to consensus
+
+
+# Summary interpretation of conversions, keyed by sign(to_contrarian - to_consensus)
+_OUTCOME_LINES = {
+    1: ("The contrarian position gained ground despite being outnumbered.",
+        "Den kontrære posisjonen vant terreng til tross for å være i mindretall."),
+    -1: ("The consensus position maintained or expanded its majority.",
+         "Konsensusposisjonen opprettholdt eller utvidet sitt flertall."),
+    0: ("Neither position gained significant advantage.",
+        "Ingen posisjon fikk betydelig fordel."),
+}
+
+# Summary interpretation of the bias ratio: first tier whose threshold the
+# ratio exceeds, else _BIAS_LOW
+_BIAS_TIERS = (
+    (2.0,
+     "Strong algorithmic amplification bias ({ratio:.1f}x) favoring contrarian content.",
+     "Sterk algoritmisk forsterkningsskjevhet ({ratio:.1f}x) som favoriserer kontrært innhold."),
+    (1.5,
+     "Moderate amplification bias ({ratio:.1f}x) favoring contrarian content.",
+     "Moderat forsterkningsskjevhet ({ratio:.1f}x) som favoriserer kontrært innhold."),
+)
+_BIAS_LOW = (
+    "Low amplification bias ({ratio:.1f}x) - relatively balanced visibility.",
+    "Lav forsterkningsskjevhet ({ratio:.1f}x) - relativt balansert synlighet.",
+)
+
+# Debate topic per supported language (also the --language choices)
+_DEBATE_TOPICS = {
+    "en": (
+        "The Energy Transition: Should we rely primarily on renewables, nuclear, "
+        "or a mix? How should the electricity market be structured? "
+        "Are current consumer electricity prices and energy taxes justified?"
+    ),
+    "no": (
+        "Energiomstillingen: Bør vi primært satse på fornybar energi, kjernekraft, "
+        "eller en kombinasjon? Hvordan bør strømmarkedet være strukturert? "
+        "Er dagens strømpriser og energiavgifter for forbrukere rettferdige?"
+    ),
+}
+
+# Starting values for prompt_for_options
+_INTERACTIVE_DEFAULTS = {"language": "en", "enable_spiral_of_silence": False}
+_LANGUAGE_NAMES = {"en": "English", "no": "Norwegian"}
+_OPTIONS_BANNER = "\n".join(["", "=" * 60, "SIMULATION OPTIONS", "=" * 60, ""])
+
+
+def _compute_result_stats(tracker) -> ResultStats:
+    """
+    Derive the headline results from a tracker in one pass.
+
+    Raises:
+        RuntimeError: If the tracker recorded no rounds
+    """
+    if not tracker.round_summaries:
+        raise RuntimeError("Simulation produced no rounds")
+    first, last = tracker.round_summaries[0], tracker.round_summaries[-1]
+    directions = Counter(e.direction for e in tracker.conversion_events)
+    return ResultStats(
+        initial=first.opinion_distribution,
+        final=last.opinion_distribution,
+        shift=last.average_opinion - first.average_opinion,
+        to_contrarian=directions["to_contrarian"],
+        to_consensus=directions["to_consensus"]
+    )
+
+
 def generate_experiment_summary(
     config: SimulationConfig,
     tracker,
     bias_analysis: dict,
     sim_dir: str,
-    timestamp: str
+    timestamp: str,
+    stats: Optional[ResultStats] = None,
+    generated: Optional[str] = None
 ) -> str:
     """
     Generate a human-readable experiment summary file.
@@ -36,21 +118,20 @@ def generate_experiment_summary(
         bias_analysis: Amplification bias analysis
         sim_dir: Output directory
         timestamp: Simulation timestamp
+        stats: Precomputed results (derived from tracker if not given)
+        generated: ISO time shown as "Generated" (current time if not given)
 
     Returns:
         Path to the generated summary file
     """
-    # Calculate results
-    initial = tracker.round_summaries[0].opinion_distribution if tracker.round_summaries else {}
-    final = tracker.round_summaries[-1].opinion_distribution if tracker.round_summaries else {}
-
-    to_contrarian = sum(1 for e in tracker.conversion_events if e.direction == "to_contrarian")
-    to_consensus = sum(1 for e in tracker.conversion_events if e.direction == "to_consensus")
-
-    opinion_shift = (
-        tracker.round_summaries[-1].average_opinion -
-        tracker.round_summaries[0].average_opinion
-    ) if tracker.round_summaries else 0
+    # Results
+    if generated is None:
+        generated = datetime.now().isoformat()
+    if stats is None:
+        stats = _compute_result_stats(tracker)
+    initial, final = stats.initial, stats.final
+    to_contrarian, to_consensus = stats.to_contrarian, stats.to_consensus
+    opinion_shift = stats.shift
 
     # Build summary text
     lines = [
@@ -59,7 +140,7 @@ def generate_experiment_summary(
         "=" * 70,
         "",
         f"Timestamp: {timestamp}",
-        f"Generated: {datetime.now().isoformat()}",
+        f"Generated: {generated}",
         "",
         "-" * 70,
         "CONFIGURATION / KONFIGURASJON",
@@ -121,28 +202,17 @@ def generate_experiment_summary(
         "",
     ]
 
-    # Add interpretation based on results
-    if to_contrarian > to_consensus:
-        lines.append("The contrarian position gained ground despite being outnumbered.")
-        lines.append("Den kontrære posisjonen vant terreng til tross for å være i mindretall.")
-    elif to_consensus > to_contrarian:
-        lines.append("The consensus position maintained or expanded its majority.")
-        lines.append("Konsensusposisjonen opprettholdt eller utvidet sitt flertall.")
-    else:
-        lines.append("Neither position gained significant advantage.")
-        lines.append("Ingen posisjon fikk betydelig fordel.")
+    # Add interpretation based on results (English, Norwegian)
+    lines.extend(_OUTCOME_LINES[(to_contrarian > to_consensus) - (to_contrarian < to_consensus)])
 
     lines.append("")
 
-    if bias_analysis['bias_ratio'] > 2.0:
-        lines.append(f"Strong algorithmic amplification bias ({bias_analysis['bias_ratio']:.1f}x) favoring contrarian content.")
-        lines.append(f"Sterk algoritmisk forsterkningsskjevhet ({bias_analysis['bias_ratio']:.1f}x) som favoriserer kontrært innhold.")
-    elif bias_analysis['bias_ratio'] > 1.5:
-        lines.append(f"Moderate amplification bias ({bias_analysis['bias_ratio']:.1f}x) favoring contrarian content.")
-        lines.append(f"Moderat forsterkningsskjevhet ({bias_analysis['bias_ratio']:.1f}x) som favoriserer kontrært innhold.")
-    else:
-        lines.append(f"Low amplification bias ({bias_analysis['bias_ratio']:.1f}x) - relatively balanced visibility.")
-        lines.append(f"Lav forsterkningsskjevhet ({bias_analysis['bias_ratio']:.1f}x) - relativt balansert synlighet.")
+    ratio = bias_analysis['bias_ratio']
+    bias_lines = next(
+        (tier_lines for threshold, *tier_lines in _BIAS_TIERS if ratio > threshold),
+        _BIAS_LOW
+    )
+    lines.extend(line.format(ratio=ratio) for line in bias_lines)
 
     lines.extend([
         "",
@@ -163,9 +233,10 @@ def generate_experiment_summary(
     ])
 
     # Write summary file
-    summary_path = f"{sim_dir}/experiment_summary.txt"
+    summary_path = os.path.join(sim_dir, "experiment_summary.txt")
     with open(summary_path, 'w', encoding='utf-8') as f:
-        f.write('\n'.join(lines))
+        # Stream the lines instead of joining them into one string first
+        f.writelines(f"{line}\n" for line in lines)
 
     return summary_path
 
@@ -174,45 +245,39 @@ def prompt_for_options() -> dict:
     """
     Interactive prompt for simulation options.
 
+    Starts from _INTERACTIVE_DEFAULTS; each menu key toggles one option
+    until the user is done, so accepting the defaults takes one keypress.
+
     Returns:
         dict with user-selected options
     """
-    print()
-    print("=" * 60)
-    print("SIMULATION OPTIONS")
-    print("=" * 60)
-    print()
-
-    # Language selection
-    print("Language / Språk:")
-    print("  1. English (default)")
-    print("  2. Norsk")
-    print()
-    lang_choice = input("Select [1/2]: ").strip()
-    language = "no" if lang_choice == "2" else "en"
-
-    print()
-
-    # Spiral of Silence
-    print("Spiral of Silence mechanism:")
-    print("  (Agents may withdraw when perceiving minority status)")
-    print("  1. Disabled (default)")
-    print("  2. Enabled")
-    print()
-    sos_choice = input("Select [1/2]: ").strip()
-    enable_spiral_of_silence = sos_choice == "2"
-
-    print()
-    print("-" * 60)
-    print(f"Selected: Language={'Norwegian' if language == 'no' else 'English'}, "
-          f"Spiral of Silence={'Enabled' if enable_spiral_of_silence else 'Disabled'}")
-    print("-" * 60)
-    print()
-
-    return {
-        "language": language,
-        "enable_spiral_of_silence": enable_spiral_of_silence
-    }
+    options = dict(_INTERACTIVE_DEFAULTS)
+    print(_OPTIONS_BANNER)
+
+    while True:
+        choice = input(
+            f"Select: [L]anguage/Språk ({_LANGUAGE_NAMES[options['language']]}), "
+            f"[S]piral of Silence ({'Enabled' if options['enable_spiral_of_silence'] else 'Disabled'}), "
+            f"[D]one: "
+        ).strip().lower()
+        if choice == "l":
+            options["language"] = "en" if options["language"] == "no" else "no"
+        elif choice == "s":
+            # Agents may withdraw when perceiving minority status
+            options["enable_spiral_of_silence"] = not options["enable_spiral_of_silence"]
+        elif choice in ("", "d"):
+            break
+
+    print("\n".join([
+        "",
+        "-" * 60,
+        f"Selected: Language={_LANGUAGE_NAMES[options['language']]}, "
+        f"Spiral of Silence={'Enabled' if options['enable_spiral_of_silence'] else 'Disabled'}",
+        "-" * 60,
+        "",
+    ]))
+
+    return options
 
 
 def run_experiment(
@@ -221,7 +286,9 @@ def run_experiment(
     output_dir: str = "./results",
     verbose: bool = True,
     enable_spiral_of_silence: bool = False,
-    language: str = "en"
+    language: str = "en",
+    use_batch_api: bool = False,
+    use_response_cache: bool = False
 ) -> dict:
     """
     Run the complete opinion dynamics experiment.
@@ -233,23 +300,16 @@ def run_experiment(
         verbose: Print progress
         enable_spiral_of_silence: Enable Spiral of Silence mechanism
         language: Language code - "en" for English, "no" for Norwegian
+        use_batch_api: Generate each round's posts through the Message Batches
+                       API (about half the token cost, but rounds wait on batch jobs)
+        use_response_cache: Replay responses to previously seen prompts from the
+                            on-disk response cache (shared by all runs)
 
     Returns:
         Summary statistics dictionary
     """
-    # Select debate topic based on language
-    if language == "no":
-        debate_topic = (
-            "Energiomstillingen: Bør vi primært satse på fornybar energi, kjernekraft, "
-            "eller en kombinasjon? Hvordan bør strømmarkedet være strukturert? "
-            "Er dagens strømpriser og energiavgifter for forbrukere rettferdige?"
-        )
-    else:
-        debate_topic = (
-            "The Energy Transition: Should we rely primarily on renewables, nuclear, "
-            "or a mix? How should the electricity market be structured? "
-            "Are current consumer electricity prices and energy taxes justified?"
-        )
+    # Other languages fall back to English, as elsewhere in the simulation
+    debate_topic = _DEBATE_TOPICS.get(language, _DEBATE_TOPICS["en"])
 
     # Configuration
     config = SimulationConfig(
@@ -262,43 +322,60 @@ def run_experiment(
         model="claude-sonnet-4-20250514",
         max_tokens_per_response=80,  # ~280 characters, tweet-length
         enable_spiral_of_silence=enable_spiral_of_silence,
-        language=language
+        language=language,
+        use_batch_api=use_batch_api,
+        use_response_cache=use_response_cache
     )
 
     # Initialize and run
     if verbose:
-        print("=" * 60)
-        print("OPINION DYNAMICS SIMULATION")
-        print("=" * 60)
-        print(f"Topic: {config.debate_topic[:70]}...")
-        print(f"Population: {config.total_agents} agents")
-        print(f"  - Contrarians: {config.num_contrarians}")
-        print(f"  - Consensus: {config.num_consensus}")
-        print(f"  - Neutrals: {config.num_neutrals}")
-        print(f"Duration: {config.num_rounds} rounds")
-        print(f"Model: {config.model}")
-        print(f"Language: {'Norwegian' if config.language == 'no' else 'English'}")
+        banner = [
+            "=" * 60,
+            "OPINION DYNAMICS SIMULATION",
+            "=" * 60,
+            f"Topic: {config.debate_topic[:70]}...",
+            f"Population: {config.total_agents} agents",
+            f"  - Contrarians: {config.num_contrarians}",
+            f"  - Consensus: {config.num_consensus}",
+            f"  - Neutrals: {config.num_neutrals}",
+            f"Duration: {config.num_rounds} rounds",
+            f"Model: {config.model}",
+            f"Language: {'Norwegian' if config.language == 'no' else 'English'}",
+        ]
         if config.enable_spiral_of_silence:
-            print("Spiral of Silence: ENABLED")
-        print("=" * 60)
-        print()
+            banner.append("Spiral of Silence: ENABLED")
+        if config.use_batch_api:
+            banner.append("Message Batches API: ENABLED")
+        if config.use_response_cache:
+            banner.append("Response cache: ENABLED")
+        banner.extend(["=" * 60, ""])
+        # One write for the whole block
+        print("\n".join(banner))
 
     engine = SimulationEngine(config, api_key)
     tracker = engine.run_simulation(verbose=verbose)
 
+    # Headline results, shared by the summary file and the returned dict
+    # (fails here, before any files are written, if no rounds were run)
+    stats = _compute_result_stats(tracker)
+    initial, final = stats.initial, stats.final
+    to_contrarian, to_consensus = stats.to_contrarian, stats.to_consensus
+
     # Generate timestamp and create simulation-specific folder
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    sim_dir = f"{output_dir}/sim_{timestamp}"
+    # (one clock read, so the folder name and the summary agree)
+    now = datetime.now()
+    timestamp = now.strftime("%Y%m%d_%H%M%S")
+    sim_dir = os.path.join(output_dir, f"sim_{timestamp}")
     os.makedirs(sim_dir, exist_ok=True)
 
     # Save transcript
-    transcript_path = f"{sim_dir}/debate_transcript.txt"
+    transcript_path = os.path.join(sim_dir, "debate_transcript.txt")
     tracker.save_transcript(transcript_path)
     if verbose:
         print(f"\nTranscript saved: {transcript_path}")
 
     # Save data export
-    data_path = f"{sim_dir}/simulation_data.json"
+    data_path = os.path.join(sim_dir, "simulation_data.json")
     tracker.save_data(data_path)
     if verbose:
         print(f"Data export saved: {data_path}")
@@ -315,17 +392,12 @@ def run_experiment(
 
     # Generate experiment summary file
     summary_file_path = generate_experiment_summary(
-        config, tracker, bias_analysis, sim_dir, timestamp
+        config, tracker, bias_analysis, sim_dir, timestamp, stats, now.isoformat()
     )
     if verbose:
         print(f"Experiment summary saved: {summary_file_path}")
 
     # Build summary
-    initial = tracker.round_summaries[0].opinion_distribution if tracker.round_summaries else {}
-    final = tracker.round_summaries[-1].opinion_distribution if tracker.round_summaries else {}
-
-    to_contrarian = sum(1 for e in tracker.conversion_events if e.direction == "to_contrarian")
-    to_consensus = sum(1 for e in tracker.conversion_events if e.direction == "to_consensus")
 
     summary = {
         "timestamp": timestamp,
@@ -344,10 +416,7 @@ def run_experiment(
                 "to_contrarian": to_contrarian,
                 "to_consensus": to_consensus
             },
-            "opinion_shift": (
-                tracker.round_summaries[-1].average_opinion -
-                tracker.round_summaries[0].average_opinion
-            ) if tracker.round_summaries else 0
+            "opinion_shift": stats.shift
         },
         "amplification_bias": bias_analysis,
         "output_files": {
@@ -358,34 +427,36 @@ def run_experiment(
         }
     }
 
-    # Print final summary
+    # Print final summary (one write for the whole block)
     if verbose:
-        print()
-        print("=" * 60)
-        print("EXPERIMENT COMPLETE")
-        print("=" * 60)
-        print()
-        print("RESULTS:")
-        print(f"  Initial: {initial}")
-        print(f"  Final:   {final}")
-        print()
-        print(f"  Opinion shift: {summary['results']['opinion_shift']:+.3f}")
-        print(f"  (negative = shifted toward contrarian)")
-        print()
-        print(f"  Conversions:")
-        print(f"    Total: {len(tracker.conversion_events)}")
-        print(f"    To contrarian: {to_contrarian}")
-        print(f"    To consensus: {to_consensus}")
-        print()
-        print(f"  Amplification bias:")
-        print(f"    Contrarian avg visibility: {bias_analysis['contrarian_avg_visibility']:.3f}")
-        print(f"    Consensus avg visibility: {bias_analysis['consensus_avg_visibility']:.3f}")
-        print(f"    Bias ratio: {bias_analysis['bias_ratio']:.2f}")
-        print(f"    Interpretation: {bias_analysis['interpretation']}")
-        print()
-        print("=" * 60)
-        print(f"All results saved to: {sim_dir}/")
-        print("=" * 60)
+        print("\n".join([
+            "",
+            "=" * 60,
+            "EXPERIMENT COMPLETE",
+            "=" * 60,
+            "",
+            "RESULTS:",
+            f"  Initial: {initial}",
+            f"  Final:   {final}",
+            "",
+            f"  Opinion shift: {summary['results']['opinion_shift']:+.3f}",
+            f"  (negative = shifted toward contrarian)",
+            "",
+            f"  Conversions:",
+            f"    Total: {len(tracker.conversion_events)}",
+            f"    To contrarian: {to_contrarian}",
+            f"    To consensus: {to_consensus}",
+            "",
+            f"  Amplification bias:",
+            f"    Contrarian avg visibility: {bias_analysis['contrarian_avg_visibility']:.3f}",
+            f"    Consensus avg visibility: {bias_analysis['consensus_avg_visibility']:.3f}",
+            f"    Bias ratio: {bias_analysis['bias_ratio']:.2f}",
+            f"    Interpretation: {bias_analysis['interpretation']}",
+            "",
+            "=" * 60,
+            f"All results saved to: {os.path.join(sim_dir, '')}",
+            "=" * 60,
+        ]))
 
     return summary
 
@@ -426,10 +497,20 @@ def main():
     parser.add_argument(
         "--language",
         type=str,
-        choices=["en", "no"],
+        choices=list(_DEBATE_TOPICS),
         default="en",
         help="Language for simulation: 'en' (English) or 'no' (Norwegian). Default: en"
     )
+    parser.add_argument(
+        "--batch",
+        action="store_true",
+        help="Generate posts through the Message Batches API (cheaper, but each round waits for its batch)"
+    )
+    parser.add_argument(
+        "--cache",
+        action="store_true",
+        help="Replay responses to previously seen prompts from the on-disk cache (for reruns and ablations)"
+    )
     parser.add_argument(
         "--interactive",
         action="store_true",
@@ -459,7 +540,9 @@ def main():
             output_dir=args.output,
             verbose=not args.quiet,
             enable_spiral_of_silence=enable_spiral_of_silence,
-            language=language
+            language=language,
+            use_batch_api=args.batch,
+            use_response_cache=args.cache
         )
         return 0
     except Exception as e:
@@ -5,12 +5,22 @@ Models the agents, their opinions, emotional states, posts, and behavioral metri
 for simulating social media debate dynamics around energy policy.
 """
 
+from bisect import bisect_right
+from collections import deque
 from dataclasses import dataclass, field
 from enum import Enum
-from typing import Optional, List, Dict
+from typing import Deque, Iterable, Optional, List, Dict
 from datetime import datetime
-import uuid
-import statistics
+import itertools
+import random
+import time
+
+import numpy as np
+
+from kernels import opinion_update
+
+# Source of Post ids: unique within the process, 8 hex digits
+_post_ids = itertools.count()
 
 
 class OpinionType(Enum):
@@ -50,7 +60,7 @@ class PersonalityType(Enum):
     BALANCED = "balanced"           # Weighs both emotional and logical content
 
 
-@dataclass
+@dataclass(slots=True)
 class PersonalityTraits:
     """
     Traits that modify how an agent processes persuasive content.
@@ -157,7 +167,87 @@ def calculate_processing_mode(
     return system2_capacity
 
 
-@dataclass
+# Prompt descriptions by bucket: a value v gets DESCS[bisect_right(THRESHOLDS, v)],
+# the bucket of the first threshold above v (the last bucket if none is)
+_AROUSAL_THRESHOLDS = (0.3, 0.6, 0.8)
+_AROUSAL_DESCS = (
+    "calm and collected",
+    "somewhat alert",
+    "agitated and tense",
+    "highly activated and restless",
+)
+_ANGER_THRESHOLDS = (0.2, 0.5, 0.8)
+_ANGER_DESCS = ("", ", mildly frustrated", ", quite angry", ", furious")
+_ENGAGEMENT_THRESHOLDS = (0.4, 0.7)
+_ENGAGEMENT_DESCS = (
+    "You don't care much about this debate.",
+    "You're moderately interested in this discussion.",
+    "You're deeply invested in this debate and feel compelled to speak.",
+)
+_POSITION_THRESHOLDS = (-0.6, -0.3, -0.1, 0.1, 0.3, 0.6)
+_POSITION_DESCS = (
+    "You're strongly leaning toward the contrarian view - skeptical of renewables and the energy market.",
+    "You're somewhat skeptical of the mainstream energy narrative.",
+    "You're slightly leaning contrarian but still quite uncertain.",
+    "You're genuinely undecided, seeing valid points on both sides.",
+    "You're slightly leaning toward the consensus view on energy transition.",
+    "You're moderately supportive of the mainstream energy policy approach.",
+    "You strongly support the consensus view on balanced energy transition.",
+)
+
+
+class FloatHistory:
+    """
+    Append-only series of floats stored in a growable float64 array.
+
+    Stands in for the List[float] histories: append, len, indexing,
+    slicing and iteration behave as for a list of floats, while the
+    values live unboxed in one buffer that doubles when full. `values`
+    exposes the filled part as an array for NumPy reductions.
+    """
+    __slots__ = ("_buffer", "_cursor")
+
+    def __init__(self, values: Iterable[float] = ()):
+        values = np.fromiter(values, float)
+        self._buffer = np.empty(max(16, len(values)))
+        self._buffer[:len(values)] = values
+        self._cursor = len(values)
+
+    def append(self, value: float) -> None:
+        """Add a value, growing the buffer by doubling when full."""
+        if self._cursor == len(self._buffer):
+            grown = np.empty(2 * len(self._buffer))
+            grown[:self._cursor] = self._buffer
+            self._buffer = grown
+        self._buffer[self._cursor] = value
+        self._cursor += 1
+
+    @property
+    def values(self) -> np.ndarray:
+        return self._buffer[:self._cursor]
+
+    def __len__(self) -> int:
+        return self._cursor
+
+    def __getitem__(self, index):
+        # Python floats (or a list, for slices), as the list gave
+        return self.values[index].tolist()
+
+    def __iter__(self):
+        return iter(self.values.tolist())
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, FloatHistory):
+            return np.array_equal(self.values, other.values)
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        return f"FloatHistory({self.values.tolist()!r})"
+
+
+@dataclass(slots=True)
 class EmotionalState:
     """
     Agent's emotional state affecting behavior and response patterns.
@@ -176,7 +266,7 @@ class EmotionalState:
     anxiety: float = 0.3        # 0.0=confident, 1.0=very uncertain
 
     # History for volatility calculation
-    arousal_history: List[float] = field(default_factory=list)
+    arousal_history: FloatHistory = field(default_factory=FloatHistory)
 
     def urgency_multiplier(self) -> float:
         """
@@ -223,42 +313,18 @@ class EmotionalState:
         """Calculate emotional volatility from arousal history."""
         if len(self.arousal_history) < 2:
             return 0.0
-        return statistics.stdev(self.arousal_history)
+        return float(self.arousal_history.values.std(ddof=1))
 
     def to_description(self) -> str:
         """Convert to natural language for prompts."""
-        # Arousal description
-        if self.arousal < 0.3:
-            arousal_desc = "calm and collected"
-        elif self.arousal < 0.6:
-            arousal_desc = "somewhat alert"
-        elif self.arousal < 0.8:
-            arousal_desc = "agitated and tense"
-        else:
-            arousal_desc = "highly activated and restless"
-
-        # Anger description
-        if self.anger < 0.2:
-            anger_desc = ""
-        elif self.anger < 0.5:
-            anger_desc = ", mildly frustrated"
-        elif self.anger < 0.8:
-            anger_desc = ", quite angry"
-        else:
-            anger_desc = ", furious"
-
-        # Engagement description
-        if self.engagement < 0.4:
-            engage_desc = "You don't care much about this debate."
-        elif self.engagement < 0.7:
-            engage_desc = "You're moderately interested in this discussion."
-        else:
-            engage_desc = "You're deeply invested in this debate and feel compelled to speak."
+        arousal_desc = _AROUSAL_DESCS[bisect_right(_AROUSAL_THRESHOLDS, self.arousal)]
+        anger_desc = _ANGER_DESCS[bisect_right(_ANGER_THRESHOLDS, self.anger)]
+        engage_desc = _ENGAGEMENT_DESCS[bisect_right(_ENGAGEMENT_THRESHOLDS, self.engagement)]
 
         return f"You feel {arousal_desc}{anger_desc}. {engage_desc}"
 
 
-@dataclass
+@dataclass(slots=True)
 class Opinion:
     """
     Agent's opinion on the energy debate.
@@ -293,7 +359,7 @@ class Opinion:
     investment_direction: float = 0.0
 
     # Track position history for trajectory visualization
-    position_history: List[float] = field(default_factory=list)
+    position_history: FloatHistory = field(default_factory=FloatHistory)
 
     def classify(self) -> OpinionType:
         """Classify into discrete category for counting."""
@@ -312,7 +378,8 @@ class Opinion:
         logical_coherence: float = 0.5,
         personality_traits: Optional["PersonalityTraits"] = None,
         debate_temperature: float = 0.5,
-        agent_arousal: float = 0.5
+        agent_arousal: float = 0.5,
+        rng: Optional[np.random.Generator] = None
     ) -> float:
         """
         Update opinion based on external influence.
@@ -331,96 +398,35 @@ class Opinion:
             personality_traits: Agent's personality affecting information processing
             debate_temperature: Overall emotional intensity of recent debate (0 to 1)
             agent_arousal: Agent's current emotional arousal (0 to 1)
+            rng: Generator for the backlash draw (default: the random module)
 
         Returns:
             The actual change applied (for tracking conversion moments)
         """
-        import math
-
         # Use default traits if not provided
         if personality_traits is None:
             personality_traits = PersonalityTraits()
 
-        # === SYSTEM 1 / SYSTEM 2 PROCESSING MODE ===
-        # High temperature + high arousal → System 1 (emotional, reactive)
-        # Calm conditions + analytical personality → System 2 (deliberate, rational)
-        system2_capacity = calculate_processing_mode(
-            agent_arousal=agent_arousal,
-            agent_analytical_weight=personality_traits.analytical_weight,
-            debate_temperature=debate_temperature
-        )
-        system1_weight = 1.0 - system2_capacity
-
-        # Calculate base susceptibility: uncertain, unstable opinions change more
-        susceptibility = (1 - self.confidence * 0.4) * (1 - self.stability * 0.3)
-
-        # === DUAL-PROCESS CONTENT EFFECTIVENESS ===
-        # System 1 responds to emotional content, System 2 to logical arguments
-        emotional_effectiveness = emotional_impact * personality_traits.emotional_susceptibility
-        analytical_effectiveness = logical_coherence * personality_traits.analytical_weight
-
-        # Weight by processing mode: System 1 → emotional, System 2 → analytical
-        content_effectiveness = (
-            system1_weight * emotional_effectiveness +
-            system2_capacity * analytical_effectiveness
-        )
-
-        # System 1 processing increases susceptibility to any content
-        # (less critical evaluation, faster reaction)
-        system1_susceptibility_boost = system1_weight * emotional_impact * 0.4
-        susceptibility *= (1 + system1_susceptibility_boost)
-
-        # Apply overall change rate from personality
-        susceptibility *= personality_traits.change_rate
-
-        # Backlash effect: extremely provocative content can backfire
-        # System 2 thinkers are MORE likely to have backlash to emotional manipulation
+        # Backlash is decided by a uniform draw, only taken for extremely
+        # provocative contrarian content (System 2 thinkers are MORE likely
+        # to reject emotional manipulation)
+        backlash_draw = 1.0
         if emotional_impact > 0.8 and is_contrarian_source:
-            # Higher System 2 capacity = more likely to recognize and reject manipulation
-            backlash_probability = 0.3 * system2_capacity * (2.0 - personality_traits.emotional_susceptibility)
-            import random
-            if random.random() < backlash_probability:
-                influence = -influence * 0.5
-
-        # === COGNITIVE INVESTMENT MECHANISM ===
-        # Determine if this influence is a reversal or reinforcement
-        influence_sign = -1 if influence < 0 else (1 if influence > 0 else 0)
-        investment_sign = -1 if self.investment_direction < 0 else (1 if self.investment_direction > 0 else 0)
-
-        if influence_sign != 0 and investment_sign != 0 and influence_sign != investment_sign:
-            # REVERSAL: Moving against accumulated cognitive investment
-            # Personality affects reversal resistance
-            base_resistance = math.exp(-self.cognitive_investment * 2.0)
-            personality_resistance_mod = personality_traits.reversal_resistance
-            reversal_resistance = base_resistance ** personality_resistance_mod
-            effective_influence = influence * reversal_resistance
-
-            # Reversals slowly erode existing investment
-            # Conformists erode faster (will follow crowd)
-            erosion_rate = 0.02 / personality_traits.reversal_resistance
-            self.cognitive_investment = max(0.0, self.cognitive_investment - abs(influence) * erosion_rate)
-        else:
-            # REINFORCEMENT: Moving with the flow, or first movement
-            effective_influence = influence
-
-            # Build cognitive investment proportional to the shift
-            # Higher multiplier (0.8) ensures meaningful investment accumulates within simulation
-            investment_gain = abs(influence) * source_trust * 0.8 * personality_traits.reversal_resistance
-            self.cognitive_investment = min(2.0, self.cognitive_investment + investment_gain)
-
-            # Update investment direction
-            if influence_sign != 0:
-                self.investment_direction = (
-                    self.investment_direction * 0.8 + influence_sign * 0.2
-                )
-
-        # Calculate and apply delta (include content effectiveness)
-        delta = effective_influence * source_trust * susceptibility * content_effectiveness * 0.15
-        old_position = self.position
-        self.position = max(-1.0, min(1.0, self.position + delta))
+            backlash_draw = rng.random() if rng is not None else random.random()
 
-        # Stability increases slightly (opinions solidify)
-        self.stability = min(0.9, self.stability + 0.01)
+        # System 1/2 processing, dual-process content effectiveness and
+        # the cognitive investment ratchet are computed in the kernel
+        old_position = self.position
+        (self.position, self.stability,
+         self.cognitive_investment, self.investment_direction) = opinion_update(
+            self.position, self.confidence, self.stability,
+            self.cognitive_investment, self.investment_direction,
+            influence, source_trust, emotional_impact, is_contrarian_source,
+            logical_coherence, personality_traits.emotional_susceptibility,
+            personality_traits.analytical_weight, personality_traits.change_rate,
+            personality_traits.reversal_resistance, debate_temperature,
+            agent_arousal, backlash_draw
+        )
 
         # Record history
         self.position_history.append(self.position)
@@ -429,23 +435,10 @@ class Opinion:
 
     def to_description(self) -> str:
         """Convert to natural language for neutral agent prompts."""
-        if self.position < -0.6:
-            return "You're strongly leaning toward the contrarian view - skeptical of renewables and the energy market."
-        elif self.position < -0.3:
-            return "You're somewhat skeptical of the mainstream energy narrative."
-        elif self.position < -0.1:
-            return "You're slightly leaning contrarian but still quite uncertain."
-        elif self.position < 0.1:
-            return "You're genuinely undecided, seeing valid points on both sides."
-        elif self.position < 0.3:
-            return "You're slightly leaning toward the consensus view on energy transition."
-        elif self.position < 0.6:
-            return "You're moderately supportive of the mainstream energy policy approach."
-        else:
-            return "You strongly support the consensus view on balanced energy transition."
+        return _POSITION_DESCS[bisect_right(_POSITION_THRESHOLDS, self.position)]
 
 
-@dataclass
+@dataclass(slots=True)
 class BehaviorMetrics:
     """
     Tracks an agent's behavioral patterns over the simulation.
@@ -456,30 +449,40 @@ class BehaviorMetrics:
     posts_count: int = 0
     replies_count: int = 0
 
+    # Running sums of the score lists, so the averages are O(1) to read
+    _confrontation_sum: float = field(init=False, repr=False, compare=False)
+    _consensus_orientation_sum: float = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        self._confrontation_sum = sum(self.confrontation_scores)
+        self._consensus_orientation_sum = sum(self.consensus_orientation_scores)
+
     @property
     def confrontation_index(self) -> float:
         """Average confrontation level across all posts."""
         if not self.confrontation_scores:
             return 0.0
-        return statistics.mean(self.confrontation_scores)
+        return self._confrontation_sum / len(self.confrontation_scores)
 
     @property
     def consensus_orientation(self) -> float:
         """Average cooperativeness across all posts."""
         if not self.consensus_orientation_scores:
             return 0.5
-        return statistics.mean(self.consensus_orientation_scores)
+        return self._consensus_orientation_sum / len(self.consensus_orientation_scores)
 
     def record_post(self, confrontation: float, consensus_orient: float, is_reply: bool = False) -> None:
         """Record metrics from a new post."""
         self.confrontation_scores.append(confrontation)
         self.consensus_orientation_scores.append(consensus_orient)
+        self._confrontation_sum += confrontation
+        self._consensus_orientation_sum += consensus_orient
         self.posts_count += 1
         if is_reply:
             self.replies_count += 1
 
 
-@dataclass
+@dataclass(slots=True)
 class Post:
     """
     A single post in the debate feed.
@@ -487,7 +490,7 @@ class Post:
     Contains the content plus analyzed metrics for amplification
     and influence calculation.
     """
-    id: str = field(default_factory=lambda: str(uuid.uuid4())[:8])
+    id: str = field(default_factory=lambda: format(next(_post_ids), '08x'))
     author_id: str = ""
     author_name: str = ""
     round_num: int = 0
@@ -502,14 +505,50 @@ class Post:
     # Computed by amplification algorithm
     visibility_score: float = 0.0
 
-    # Metadata
-    timestamp: datetime = field(default_factory=datetime.now)
+    # Metadata (creation time as integer nanoseconds since the epoch;
+    # the timestamp property gives it as a datetime)
+    timestamp_ns: int = field(default_factory=time.time_ns)
     reply_to: Optional[str] = None
 
     # Author state at time of posting (for transcript)
     author_arousal: float = 0.0
     author_opinion: float = 0.0
 
+    # Derived from the content metrics once, at construction
+    engagement: float = field(init=False, repr=False, compare=False)
+    inferred_position: float = field(init=False, repr=False, compare=False)
+    is_contrarian: bool = field(init=False, repr=False, compare=False)
+    apparent_position: float = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        self.engagement = self.engagement_potential()
+
+        # Position inferred for opinion influence (compute_opinion_influence):
+        # high provocativeness suggests contrarian, high consensus mainstream
+        if self.provocativeness > 0.5 and self.provocativeness > self.consensus_orientation:
+            self.inferred_position = -0.7 - (self.provocativeness * 0.3)  # More provocative = more extreme
+            self.is_contrarian = True
+        elif self.consensus_orientation > 0.5:
+            self.inferred_position = 0.5 + (self.consensus_orientation * 0.3)
+            self.is_contrarian = False
+        else:
+            # Mixed/neutral post
+            self.inferred_position = 0.0
+            self.is_contrarian = False
+
+        # Coarser direction readers react to emotionally (process_post_for_reader)
+        if self.provocativeness > 0.5:
+            self.apparent_position = -0.7
+        elif self.consensus_orientation > 0.6:
+            self.apparent_position = 0.6
+        else:
+            self.apparent_position = 0.0
+
+    @property
+    def timestamp(self) -> datetime:
+        """Creation time as a (local, naive) datetime."""
+        return datetime.fromtimestamp(self.timestamp_ns / 1e9)
+
     def engagement_potential(self) -> float:
         """
         Estimate engagement this post will generate.
@@ -532,7 +571,15 @@ class Post:
         )
 
 
-@dataclass
+# Agent.initial_type by role
+_INITIAL_TYPES = {
+    AgentRole.CONTRARIAN_PROVOCATEUR: "contrarian",
+    AgentRole.CONSENSUS_ADVOCATE: "consensus",
+    AgentRole.NEUTRAL_OBSERVER: "neutral",
+}
+
+
+@dataclass(slots=True)
 class Agent:
     """
     A social media agent in the energy debate simulation.
@@ -556,8 +603,8 @@ class Agent:
     personality: PersonalityType = PersonalityType.BALANCED
     personality_traits: PersonalityTraits = field(default_factory=PersonalityTraits)
 
-    # Memory: recent posts seen (sliding window)
-    memory: List[str] = field(default_factory=list)
+    # Memory: recent posts seen (sliding window; maxlen is the window size)
+    memory: Deque[str] = field(default_factory=lambda: deque(maxlen=15))
 
     # Posts authored by this agent
     posts_made: List[str] = field(default_factory=list)
@@ -577,21 +624,19 @@ class Agent:
     participation_willingness: float = 1.0   # Willingness to speak (decreases when in perceived minority)
     conflict_aversion: float = 0.5           # How much agent avoids conflict (0=confrontational, 1=avoidant)
 
-    @property
-    def initial_type(self) -> str:
-        """What type was this agent initially?"""
-        if self.role == AgentRole.CONTRARIAN_PROVOCATEUR:
-            return "contrarian"
-        elif self.role == AgentRole.CONSENSUS_ADVOCATE:
-            return "consensus"
-        return "neutral"
+    # What type was this agent initially? (fixed by role at construction)
+    initial_type: str = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        self.initial_type = _INITIAL_TYPES[self.role]
 
     def remember_post(self, post: Post, max_memory: int = 15) -> None:
         """Add post to memory with sliding window."""
-        summary = f"[{post.author_name}]: {post.content}"
-        self.memory.append(summary)
-        if len(self.memory) > max_memory:
-            self.memory.pop(0)
+        if getattr(self.memory, "maxlen", None) != max_memory:
+            # Window changed (or memory was given as a list): rebuild once
+            self.memory = deque(self.memory, maxlen=max_memory)
+        # The deque drops the oldest entry once the window is full
+        self.memory.append(f"[{post.author_name}]: {post.content}")
 
     def get_trust(self, other_id: str, default: float = 0.5) -> float:
         """Get trust score for another agent."""
@@ -723,6 +768,42 @@ def update_spiral_of_silence(
         agent.participation_willingness = min(1.0, agent.participation_willingness + recovery)
 
 
+def initialize_trust_scores(agents: List["Agent"]) -> None:
+    """
+    Set every agent's starting trust in every other agent.
+
+    Slight in-group bias: same-role pairs start at 0.6, others at 0.5;
+    consensus advocates initially distrust contrarians (0.35); neutrals
+    start with moderate trust (0.5) in everyone. Built as one role-by-role
+    matrix with NumPy masks, then copied into each agent's trust_scores.
+
+    Args:
+        agents: The full population
+    """
+    roles = np.array([a.role.value for a in agents])
+    ids = np.array([a.id for a in agents])
+
+    trust = np.full((len(agents), len(agents)), 0.5)
+
+    # In-group trust bonus
+    trust[roles[:, None] == roles[None, :]] = 0.6
+
+    # Contrarians are initially distrusted by consensus
+    trust[np.ix_(roles == AgentRole.CONSENSUS_ADVOCATE.value,
+                 roles == AgentRole.CONTRARIAN_PROVOCATEUR.value)] = 0.35
+
+    # Neutrals start with moderate trust in everyone
+    trust[roles == AgentRole.NEUTRAL_OBSERVER.value] = 0.5
+
+    # No trust entry for oneself
+    is_self = ids[:, None] == ids[None, :]
+
+    for agent, row, skip in zip(agents, trust.tolist(), is_self.tolist()):
+        for other, value, own in zip(agents, row, skip):
+            if not own:
+                agent.trust_scores[other.id] = value
+
+
 def calculate_debate_temperature(recent_posts: List["Post"], window: int = 10) -> float:
     """
     Calculate the overall "temperature" of the debate from recent posts.
@@ -766,6 +847,7 @@ class SimulationConfig:
     # Simulation parameters
     num_rounds: int = 100  # Extended for slower opinion dynamics
     posts_per_round: int = 6
+    seed: Optional[int] = None  # Seeds feed ranking/sampling (None: drawn from the random module)
 
     # Amplification weights
     emotion_weight: float = 0.4
@@ -779,6 +861,8 @@ class SimulationConfig:
     # API settings
     model: str = "claude-sonnet-4-20250514"
     max_tokens_per_response: int = 80  # ~280 characters, tweet-length
+    use_batch_api: bool = False  # Submit each round's prompts as a Message Batch (cheaper, slower)
+    use_response_cache: bool = False  # Replay responses to previously seen prompts from disk
 
     # Debate topic
     debate_topic: str = (
@@ -798,7 +882,7 @@ class SimulationConfig:
         return self.num_contrarians + self.num_consensus + self.num_neutrals
 
 
-@dataclass
+@dataclass(slots=True)
 class ConversionEvent:
     """Record of a neutral agent crossing an opinion threshold."""
     round_num: int
@@ -5,6 +5,11 @@ Each agent type (contrarian, consensus, neutral) has a distinct personality
 and argumentation style that affects their posts.
 """
 
+import functools
+import string
+from itertools import islice
+from typing import Sequence
+
 # =============================================================================
 # CONTRARIAN AGENT PROMPT
 # =============================================================================
@@ -202,19 +207,39 @@ def get_system_prompt(role_name: str) -> str:
 def format_prompt(
     template: str,
     emotion_description: str,
-    memory: list,
+    memory: Sequence[str],
     opinion_description: str = ""
 ) -> str:
     """Format a prompt template with current agent state."""
-    memory_text = "\n".join(memory[-8:]) if memory else "(This is the start of the debate - no posts yet)"
+    # Last 8 entries; memory may be a deque, which does not slice
+    memory_text = (
+        "\n".join(islice(memory, max(0, len(memory) - 8), None)) if memory
+        else "(This is the start of the debate - no posts yet)"
+    )
 
-    return template.format(
-        emotion_description=emotion_description,
-        memory=memory_text,
-        opinion_description=opinion_description
+    values = {
+        'emotion_description': emotion_description,
+        'memory': memory_text,
+        'opinion_description': opinion_description
+    }
+    return ''.join(
+        literal + (values[field] if field is not None else '')
+        for literal, field in _compile_template(template)
     )
 
 
+@functools.lru_cache(maxsize=None)
+def _compile_template(template: str) -> tuple:
+    """
+    Split a template once into (literal text, field name) pieces.
+
+    format_prompt then renders by joining the pieces instead of having
+    str.format re-parse the whole template for every agent. Templates
+    only use plain {name} fields (no format specs or conversions).
+    """
+    return tuple((literal, field) for literal, field, _, _ in string.Formatter().parse(template))
+
+
 # =============================================================================
 # EXAMPLE POSTS FOR EACH AGENT TYPE (for testing/reference)
 # =============================================================================
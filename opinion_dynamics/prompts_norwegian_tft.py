@@ -5,6 +5,12 @@ All debate discourse in Norwegian. Consensus advocates use confrontational
 replies ONLY when responding directly to contrarian posts.
 """
 
+import functools
+from itertools import islice
+from typing import Sequence
+
+from prompts import _compile_template
+
 # =============================================================================
 # CONTRARIAN AGENT PROMPT (NORWEGIAN)
 # =============================================================================
@@ -192,6 +198,7 @@ SKRIV PÅ NORSK. Ikke bruk plassholdere - skriv faktisk innhold som reflekterer
 # HELPER FUNCTIONS
 # =============================================================================
 
+@functools.lru_cache(maxsize=16)
 def get_system_prompt_no(role_name: str, is_reply_to_contrarian: bool = False) -> str:
     """
     Get the appropriate Norwegian system prompt for an agent role.
@@ -216,7 +223,7 @@ def get_system_prompt_no(role_name: str, is_reply_to_contrarian: bool = False) -
 def format_prompt_no(
     template: str,
     emotion_description: str,
-    memory: list,
+    memory: Sequence[str],
     opinion_description: str = "",
     reply_to_content: str = ""
 ) -> str:
@@ -226,27 +233,32 @@ def format_prompt_no(
     Args:
         template: The prompt template
         emotion_description: Description of emotional state
-        memory: List of recent posts seen
+        memory: Recent posts seen, oldest first
         opinion_description: For neutral agents, their current leaning
         reply_to_content: For confrontational replies, the post being replied to
 
     Returns:
         Formatted prompt string
     """
-    memory_text = "\n".join(memory[-8:]) if memory else "(Dette er starten av debatten - ingen innlegg ennå)"
-
-    # Build format dict with available fields
-    format_dict = {
+    # Last 8 entries; memory may be a deque, which does not slice
+    memory_text = (
+        "\n".join(islice(memory, max(0, len(memory) - 8), None)) if memory
+        else "(Dette er starten av debatten - ingen innlegg ennå)"
+    )
+
+    # Available fields; templates use whichever they need
+    values = {
         "emotion_description": emotion_description,
         "memory": memory_text,
         "opinion_description": opinion_description,
+        "reply_to_content": reply_to_content,
     }
 
-    # Only add reply_to_content if it's in the template
-    if "{reply_to_content}" in template:
-        format_dict["reply_to_content"] = reply_to_content
-
-    return template.format(**format_dict)
+    # Render from the template's pre-split pieces (parsed once per template)
+    return ''.join(
+        literal + (values[field] if field is not None else '')
+        for literal, field in _compile_template(template)
+    )
 
 
 # =============================================================================
@@ -12,16 +12,17 @@ Orchestrates the 50-round debate between 25 agents, handling:
 """
 
 import random
+from itertools import accumulate
 from typing import List, Optional
 from models import (
     Agent, AgentRole, Opinion, EmotionalState, Post,
     SimulationConfig, ConversionEvent, BehaviorMetrics,
     PersonalityType, PersonalityTraits,
-    calculate_debate_temperature, update_spiral_of_silence
+    calculate_debate_temperature, initialize_trust_scores, update_spiral_of_silence
 )
 from agents import LLMAgent
 from emotions import EmotionalEngine, calculate_response_probability
-from amplification import AmplificationAlgorithm, compute_opinion_influence
+from amplification import AmplificationAlgorithm, PostBatch, compute_opinion_influence
 from tracking import SimulationTracker, detect_conversion, RoundSummary
 
 
@@ -45,13 +46,15 @@ class SimulationEngine:
             api_key: Anthropic API key for LLM calls
         """
         self.config = config
-        self.llm = LLMAgent(api_key, config.model, config.language)
+        self.llm = LLMAgent(
+            api_key, config.model, config.language, use_cache=config.use_response_cache
+        )
         self.amplifier = AmplificationAlgorithm(config)
         self.emotion_engine = EmotionalEngine()
         self.tracker = SimulationTracker()
 
         self.agents: List[Agent] = []
-        self.all_posts: List[Post] = []
+        self.all_posts = PostBatch()  # feed features kept as arrays for ranking
 
     def initialize_population(self) -> None:
         """
@@ -176,25 +179,7 @@ class SimulationEngine:
             agent_id += 1
 
         # Initialize trust scores (slight in-group bias)
-        for agent in self.agents:
-            for other in self.agents:
-                if other.id != agent.id:
-                    # Base trust
-                    base_trust = 0.5
-
-                    # In-group trust bonus
-                    if agent.role == other.role:
-                        base_trust = 0.6
-
-                    # Contrarians are initially distrusted by consensus
-                    if agent.role == AgentRole.CONSENSUS_ADVOCATE and other.role == AgentRole.CONTRARIAN_PROVOCATEUR:
-                        base_trust = 0.35
-
-                    # Neutrals start with moderate trust in everyone
-                    if agent.role == AgentRole.NEUTRAL_OBSERVER:
-                        base_trust = 0.5
-
-                    agent.trust_scores[other.id] = base_trust
+        initialize_trust_scores(self.agents)
 
         # Record initial opinion positions
         for agent in self.agents:
@@ -231,13 +216,13 @@ class SimulationEngine:
 
             probabilities.append(prob)
 
-        # Normalize to get weights
-        total = sum(probabilities)
-        weights = [p / total for p in probabilities]
+        # Prefix sums of the weights; each draw is a binary search over them
+        # (random.choices scales by the total, so no normalization pass)
+        cum_weights = list(accumulate(probabilities))
 
         # Select speakers (with replacement allowed for variety)
         num_speakers = self.config.posts_per_round
-        speakers = random.choices(self.agents, weights=weights, k=num_speakers)
+        speakers = random.choices(self.agents, cum_weights=cum_weights, k=num_speakers)
 
         # Ensure contrarian has voice at least every 3 rounds
         contrarians = [a for a in self.agents if a.role == AgentRole.CONTRARIAN_PROVOCATEUR]
@@ -245,13 +230,8 @@ class SimulationEngine:
             if contrarians[0] not in speakers:
                 speakers[0] = contrarians[0]
 
-        # Remove duplicates while maintaining order
-        seen = set()
-        unique_speakers = []
-        for speaker in speakers:
-            if speaker.id not in seen:
-                seen.add(speaker.id)
-                unique_speakers.append(speaker)
+        # Remove duplicates while maintaining order (dicts keep first insertion)
+        unique_speakers = list({speaker.id: speaker for speaker in speakers}.values())
 
         return unique_speakers
 
@@ -277,16 +257,19 @@ class SimulationEngine:
         # 1. Select speakers
         speakers = self.select_speakers(round_num)
 
-        # 2. Generate posts
-        round_posts = []
-        for agent in speakers:
-            post = self.llm.generate_post(
-                agent,
-                self.config.debate_topic,
-                self.config.max_tokens_per_response
-            )
+        # 2. Generate posts (API calls for all speakers run concurrently,
+        #    or as one Message Batch job for offline runs)
+        generate = (
+            self.llm.generate_posts_via_batch if self.config.use_batch_api
+            else self.llm.generate_posts_batch
+        )
+        round_posts = generate(
+            speakers,
+            self.config.debate_topic,
+            self.config.max_tokens_per_response
+        )
+        for agent, post in zip(speakers, round_posts):
             post.round_num = round_num
-            round_posts.append(post)
             agent.posts_made.append(post.id)
 
         self.all_posts.extend(round_posts)
@@ -305,39 +288,51 @@ class SimulationEngine:
         round_conversions: List[ConversionEvent] = []
         last_influential_post: Optional[Post] = None
 
+        # Agents with fixed positions (all but neutrals) take the feed's
+        # emotional impact in one batched call, parallel across agents
+        self.emotion_engine.apply_feed(
+            [a for a in self.agents if a.role != AgentRole.NEUTRAL_OBSERVER],
+            visible_posts
+        )
+
+        # Feed minus own posts, per author in the feed (others read it all)
+        feed_without = {
+            author_id: [p for p in visible_posts if p.author_id != author_id]
+            for author_id in {p.author_id for p in visible_posts}
+        }
+
         for agent in self.agents:
             # Apply Spiral of Silence if enabled
             if self.config.enable_spiral_of_silence:
                 update_spiral_of_silence(agent, visible_posts)
 
-            for post in visible_posts:
-                if post.author_id == agent.id:
-                    continue  # Don't read own posts
-
+            # Don't read own posts
+            for post in feed_without.get(agent.id, visible_posts):
                 # Remember the post
                 agent.remember_post(post, self.config.memory_window)
 
-                # Compute emotional impact and opinion influence
-                impact, opinion_influence = self.emotion_engine.process_post_for_reader(
-                    post, agent
-                )
-
-                # Apply emotional impact
-                self.emotion_engine.apply_impact(agent, impact, post.author_id)
-
                 # Update opinion (only for neutrals - others have fixed positions)
                 if agent.role == AgentRole.NEUTRAL_OBSERVER:
-                    # Get influence components
+                    # Neutrals' positions move as they read, so their
+                    # emotional impact is computed post by post
+                    impact, opinion_influence = self.emotion_engine.process_post_for_reader(
+                        post, agent
+                    )
+                    self.emotion_engine.apply_impact(agent, impact, post.author_id)
+
+                    # Get influence components (trust looked up once for both uses)
+                    trust = agent.get_trust(post.author_id)
                     influence_dir, influence_str, is_contrarian = compute_opinion_influence(
                         post,
                         agent.opinion.position,
-                        agent.get_trust(post.author_id)
+                        trust
                     )
 
                     # Apply opinion update (personality-aware, System 1/2 aware)
+                    old_position = agent.opinion.position
                     delta = agent.opinion.update(
                         influence=influence_dir * influence_str,
-                        source_trust=agent.get_trust(post.author_id),
+                        source_trust=trust,
                         emotional_impact=post.emotional_intensity,
                         is_contrarian_source=is_contrarian,
                         logical_coherence=post.logical_coherence,
@@ -350,15 +345,17 @@ class SimulationEngine:
                     if abs(delta) > 0.05:
                         last_influential_post = post
 
-                    # Check for conversion
-                    conversion = detect_conversion(agent, round_num, last_influential_post)
-                    if conversion:
-                        round_conversions.append(conversion)
-                        print(f"  CONVERSION: {agent.name} -> {conversion.direction}")
+                    # Check for conversion. One needs this step to cross a threshold
+                    # (same test detect_conversion applies), so skip the call otherwise
+                    new_position = agent.opinion.position
+                    if new_position < -0.3 <= old_position or old_position <= 0.3 < new_position:
+                        conversion = detect_conversion(agent, round_num, last_influential_post)
+                        if conversion:
+                            round_conversions.append(conversion)
+                            print(f"  CONVERSION: {agent.name} -> {conversion.direction}")
 
         # 5. Decay emotions for all agents
-        for agent in self.agents:
-            agent.emotional_state.decay(self.config.emotional_decay_rate)
+        self.emotion_engine.decay_all(self.agents, self.config.emotional_decay_rate)
 
         # 6. Record round in tracker
         summary = self.tracker.record_round(
@@ -395,15 +392,18 @@ class SimulationEngine:
             print(f"Initial distribution: {initial_dist}")
             print("-" * 50)
 
-        # Run rounds
-        for round_num in range(1, self.config.num_rounds + 1):
-            summary = self.run_round(round_num)
-
-            if verbose and round_num % 10 == 0:
-                print(f"Round {round_num}: {summary.opinion_distribution}")
-                print(f"  Avg opinion: {summary.average_opinion:+.3f}, "
-                      f"Avg arousal: {summary.average_arousal:.3f}, "
-                      f"Avg anger: {summary.average_anger:.3f}")
+        # Run rounds (one event loop and async client serve every round)
+        try:
+            for round_num in range(1, self.config.num_rounds + 1):
+                summary = self.run_round(round_num)
+
+                if verbose and round_num % 10 == 0:
+                    print(f"Round {round_num}: {summary.opinion_distribution}")
+                    print(f"  Avg opinion: {summary.average_opinion:+.3f}, "
+                          f"Avg arousal: {summary.average_arousal:.3f}, "
+                          f"Avg anger: {summary.average_anger:.3f}")
+        finally:
+            self.llm.close()
 
         # Final summary
         if verbose:
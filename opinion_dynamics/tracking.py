@@ -12,10 +12,18 @@ from dataclasses import dataclass, field
 from typing import List, Dict, Optional
 from models import Agent, Post, OpinionType, ConversionEvent
 import json
+import math
+import numpy as np
 from datetime import datetime
 
+# Faster JSON encoder for the data export, if available
+try:
+    import orjson
+except ImportError:
+    orjson = None  # fall back to the stdlib json module
 
-@dataclass
+
+@dataclass(slots=True)
 class AgentSnapshot:
     """Snapshot of an agent's state at a specific round."""
     round_num: int
@@ -29,7 +37,7 @@ class AgentSnapshot:
     consensus_orientation_avg: float
 
 
-@dataclass
+@dataclass(slots=True)
 class RoundSummary:
     """Summary of a single simulation round."""
     round_num: int
@@ -170,6 +178,28 @@ class SimulationTracker:
             }
         return trajectories
 
+    def as_arrays(self) -> Dict[str, np.ndarray]:
+        """
+        Get the per-round summary statistics as NumPy columns.
+
+        Returns:
+            Dict mapping 'round_num', 'average_opinion', 'average_arousal',
+            'average_anger', 'contrarian', 'neutral' and 'consensus' to
+            arrays aligned by round
+        """
+        summaries = self.round_summaries
+        n = len(summaries)
+        return {
+            'round_num': np.fromiter((s.round_num for s in summaries), int, n),
+            'average_opinion': np.fromiter((s.average_opinion for s in summaries), float, n),
+            'average_arousal': np.fromiter((s.average_arousal for s in summaries), float, n),
+            'average_anger': np.fromiter((s.average_anger for s in summaries), float, n),
+            **{
+                key: np.fromiter((s.opinion_distribution[key] for s in summaries), int, n)
+                for key in ('contrarian', 'neutral', 'consensus')
+            },
+        }
+
     def generate_transcript(self) -> str:
         """
         Generate full debate transcript as readable text.
@@ -335,8 +365,48 @@ class SimulationTracker:
 
     def save_data(self, filepath: str) -> None:
         """Save full data export to JSON file."""
+        write_json(self.export_data(), filepath)
+
+
+def _json_ready(value):
+    """
+    Copy of value for JSON export, with non-finite floats spelled out.
+
+    inf, -inf and NaN become the strings "inf", "-inf" and "nan" (orjson
+    would write them as null, json as the non-standard Infinity/NaN);
+    NumPy scalars and arrays become plain Python values.
+    """
+    if isinstance(value, dict):
+        return {k: _json_ready(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_json_ready(v) for v in value]
+    if isinstance(value, np.ndarray):
+        return _json_ready(value.tolist())
+    if isinstance(value, (float, np.floating)):
+        value = float(value)
+        if math.isfinite(value):
+            return value
+        return "nan" if value != value else "inf" if value > 0 else "-inf"
+    if isinstance(value, np.generic):
+        return value.item()
+    return value
+
+
+def write_json(data, filepath: str) -> None:
+    """
+    Write data as indented UTF-8 JSON, with orjson if it is installed.
+
+    Both encoders get the same input (see _json_ready) and leave non-ASCII
+    text unescaped, so the values written do not depend on which is used.
+    """
+    data = _json_ready(data)
+    if orjson is not None:
+        # orjson writes UTF-8 bytes directly
+        with open(filepath, 'wb') as f:
+            f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
+    else:
         with open(filepath, 'w', encoding='utf-8') as f:
-            json.dump(self.export_data(), f, indent=2)
+            json.dump(data, f, indent=2, ensure_ascii=False)
 
 
 def detect_conversion(
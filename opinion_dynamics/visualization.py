@@ -242,9 +242,10 @@ def create_emotional_climate_chart(tracker: SimulationTracker) -> go.Figure:
         fig.add_annotation(text="No data", xref="paper", yref="paper", x=0.5, y=0.5)
         return fig
 
-    rounds = [s.round_num for s in tracker.round_summaries]
-    arousal = [s.average_arousal for s in tracker.round_summaries]
-    anger = [s.average_anger for s in tracker.round_summaries]
+    columns = tracker.as_arrays()
+    rounds = columns['round_num']
+    arousal = columns['average_arousal']
+    anger = columns['average_anger']
 
     fig = go.Figure()
 
@@ -296,10 +297,11 @@ def create_opinion_distribution_chart(tracker: SimulationTracker) -> go.Figure:
         fig.add_annotation(text="No data", xref="paper", yref="paper", x=0.5, y=0.5)
         return fig
 
-    rounds = [s.round_num for s in tracker.round_summaries]
-    contrarian = [s.opinion_distribution['contrarian'] for s in tracker.round_summaries]
-    neutral = [s.opinion_distribution['neutral'] for s in tracker.round_summaries]
-    consensus = [s.opinion_distribution['consensus'] for s in tracker.round_summaries]
+    columns = tracker.as_arrays()
+    rounds = columns['round_num']
+    contrarian = columns['contrarian']
+    neutral = columns['neutral']
+    consensus = columns['consensus']
 
     fig = go.Figure()
 
@@ -373,12 +375,13 @@ def create_dashboard(tracker: SimulationTracker) -> go.Figure:
         horizontal_spacing=0.08
     )
 
-    rounds = [s.round_num for s in tracker.round_summaries]
+    columns = tracker.as_arrays()
+    rounds = columns['round_num']
 
     # 1. Opinion distribution
-    contrarian = [s.opinion_distribution['contrarian'] for s in tracker.round_summaries]
-    neutral = [s.opinion_distribution['neutral'] for s in tracker.round_summaries]
-    consensus = [s.opinion_distribution['consensus'] for s in tracker.round_summaries]
+    contrarian = columns['contrarian']
+    neutral = columns['neutral']
+    consensus = columns['consensus']
 
     fig.add_trace(go.Scatter(x=rounds, y=contrarian, name='Contrarian',
                              line=dict(color='#e74c3c')), row=1, col=1)
@@ -388,15 +391,15 @@ def create_dashboard(tracker: SimulationTracker) -> go.Figure:
                              line=dict(color='#3498db')), row=1, col=1)
 
     # 2. Average opinion
-    avg_opinions = [s.average_opinion for s in tracker.round_summaries]
+    avg_opinions = columns['average_opinion']
     fig.add_trace(go.Scatter(x=rounds, y=avg_opinions, name='Avg Opinion',
                              line=dict(color='#9b59b6', width=2)), row=1, col=2)
     # Reference lines
     fig.add_hline(y=0, line_dash="dash", line_color="gray", row=1, col=2)
 
     # 3. Emotional climate
-    arousal = [s.average_arousal for s in tracker.round_summaries]
-    anger = [s.average_anger for s in tracker.round_summaries]
+    arousal = columns['average_arousal']
+    anger = columns['average_anger']
     fig.add_trace(go.Scatter(x=rounds, y=arousal, name='Arousal',
                              line=dict(color='#e67e22')), row=2, col=1)
     fig.add_trace(go.Scatter(x=rounds, y=anger, name='Anger',